@@ -1,10 +1,9 @@
 
 import ctypes as ct
-from functools import partial
 import logging
-import socket
+import os
+import selectors
 from threading import Thread
-from time import sleep
 
 from tornado.ioloop import IOLoop
 
@@ -80,11 +79,16 @@ class SBCDecoder:
             return
         
         # setup
+        # (re)bind to the loop we are being started from, as that is where
+        # the callbacks must land
+        self.ioloop = IOLoop.current()
         self._read_mtu = read_mtu
         self._sbc = sbc_t()
         self._sbc_populated = False
         self._socket = socket
         self._socket.setblocking(True)
+        # pipe to interrupt the worker's blocking select on stop()
+        self._wake_r, self._wake_w = os.pipe()
         self._worker = Thread(
             target=self._do_decode,
             name="SBCDecoder",
@@ -99,9 +103,17 @@ class SBCDecoder:
             return
 
         self._started = False
+        # wake the worker so it exits immediately instead of waiting for
+        # the next packet
+        try:
+            os.write(self._wake_w, b'\x00')
+        except Exception:
+            pass
+        self._worker.join()
+        os.close(self._wake_r)
+        os.close(self._wake_w)
         self._socket = None
         self._read_mtu = None
-        self._worker.join()
 
     @property
     def channels(self):
@@ -133,12 +145,13 @@ class SBCDecoder:
         try:
             self._worker_proc()
         except Exception as e:
-            logger.exception("Unhandled decode error.")
-            self.ioloop.add_callback(self.stop)
-            if self.on_fatal_error:
-                self.ioloop.add_callback(partial(
-                    self.on_fatal_error,
-                    error=e))
+            # a stop() race tears the socket from under us; only a failure
+            # while running is worth reporting
+            if self._started:
+                logger.exception("Unhandled decode error.")
+                self.ioloop.add_callback(self.stop)
+                if self.on_fatal_error:
+                    self.ioloop.add_callback(self.on_fatal_error, e)
         finally:
             logger.debug("SBC decoder stopped - cleaning up libsbc.")
             self._libsbc.sbc_finish(ct.byref(self._sbc), 0)
@@ -151,55 +164,96 @@ class SBCDecoder:
         # initialise
         bufsize = self._read_mtu
         buf = ct.create_string_buffer(bufsize)
+        # preallocated receive buffer, so each packet costs zero allocations
+        pkt_buf = bytearray(bufsize)
+        pkt_ct = (ct.c_char * bufsize).from_buffer(pkt_buf)
         self._libsbc.sbc_init(ct.byref(self._sbc), 0)
         prev_seq = 0
         to_decode = ct.c_size_t() # optimisation
         to_write = ct.c_size_t() # optimisation
         written = ct.c_size_t() # optimisation
 
+        # readiness notification, so the thread blocks in the kernel instead
+        # of spinning; the wake pipe lets stop() interrupt the wait
+        sel = selectors.DefaultSelector()
+        sel.register(self._socket, selectors.EVENT_READ, "socket")
+        sel.register(self._wake_r, selectors.EVENT_READ, "wake")
+
+        # hoist the per-packet attribute lookups out of the loop; each is
+        # a __getattribute__ chain paid hundreds of times a second
+        add_callback = self.ioloop.add_callback
+        read_mtu = self._read_mtu
+        recv_into = self._socket.recv_into
+        sbc_decode = self._libsbc.sbc_decode
+        sbc_ref = ct.byref(self._sbc)
+        sel_select = sel.select
+        wake_r = self._wake_r
+
         # loop until stopped
         leftover_sbc = b''
         while self._started:
 
-            # read more RTP data in non-blocking mode
-            # note: RTP boundaries are MTU boundaries
-            packet = b''
-            try:
-                packet = self._socket.recv(
-                    self._read_mtu,
-                    socket.MSG_WAITALL)
-            except Exception as e:
-                logger.error("Socket read error - {}".format(e))
-            if len(packet) == 0:
-                sleep(0.1) # CPU busy safety
+            # wait for the kernel to signal readable data or a wake-up
+            got_data = False
+            for key, _ in sel_select():
+                if key.data == "socket":
+                    got_data = True
+                else:
+                    os.read(wake_r, 1)
+            if not got_data:
+                continue
+
+            # read more RTP data into the preallocated buffer; errors simply
+            # propagate to the guard in _do_decode, keeping this loop free of
+            # per-iteration exception blocks
+            # note: RTP boundaries are MTU boundaries (SEQPACKET transport),
+            # so no MSG_WAITALL - it would hold the thread in the kernel
+            # past the readiness signal
+            pktlen = recv_into(
+                pkt_buf,
+                read_mtu)
+            if pktlen == 0:
+                # a readable event with no data means EOF, not "try later"
+                raise ConnectionError("Transport socket closed by peer.")
+            if pktlen < 13:
+                # too short to hold the RTP (12) + payload (1) headers;
+                # the header reads below would see stale buffer bytes
+                logger.warning("Skipping truncated packet - len=%s.",
+                    pktlen)
                 continue
-            
+
             # out-of-order packet?
             # note: we need to allow for 16-bit reset
-            seq = packet[3] + (packet[2] << 8)
+            seq = pkt_buf[3] + (pkt_buf[2] << 8)
             if seq < prev_seq and prev_seq - seq <= 50:
-                logger.debug("Skipping old packet - prev={}, seq={}".format(
-                    prev_seq, seq))
+                logger.debug("Skipping old packet - prev=%s, seq=%s",
+                    prev_seq, seq)
                 continue
             prev_seq = seq
 
             # strip RTP padding
-            has_padding = bool((packet[0] & 0x04) >> 2)
+            has_padding = bool((pkt_buf[0] & 0x04) >> 2)
             if has_padding:
-                num_pad_bytes = packet[-1]
-                logger.debug("Stripping {} RTP pad bytes off the end.".format(
-                    num_pad_bytes))
-                packet = packet[:-num_pad_bytes]
-
-            # strip RTP header (12) and payload header (1)
-            data = packet[13:]
-            buf.value = data
-            readlen = len(data)
-                
+                num_pad_bytes = pkt_buf[pktlen-1]
+                logger.debug("Stripping %s RTP pad bytes off the end.",
+                    num_pad_bytes)
+                pktlen -= num_pad_bytes
+                if pktlen < 13:
+                    # a bogus peer-supplied pad count would push readlen
+                    # negative, and memmove takes that as a huge size_t
+                    logger.warning("Skipping over-padded packet - "
+                        "pad=%s.", num_pad_bytes)
+                    continue
+
+            # strip RTP header (12) and payload header (1) by copying the
+            # payload straight into the decode input buffer
+            readlen = pktlen - 13
+            ct.memmove(buf, ct.byref(pkt_ct, 13), readlen)
+
             # create decode buffer if we haven't already
             if not self._sbc_populated:
                 try:
-                    self._populate_sbct(data=data)
+                    self._populate_sbct(data=pkt_buf[13:pktlen])
                 except Exception as e:
                     logger.error(e)
                     continue
@@ -218,9 +272,16 @@ class SBCDecoder:
                 decode_bufsize = \
                     int(bufsize / SBC_MIN_FRAME_LEN + 1) * \
                     self._libsbc.sbc_get_codesize(ct.byref(self._sbc))
-                decode_buf = ct.create_string_buffer(decode_bufsize)
+                # small rotating pool, so a view can still be in-flight to
+                # the consumer while the next packets are being decoded
+                decode_pool = [
+                    ct.create_string_buffer(decode_bufsize)
+                    for _ in range(4)]
+                decode_views = [memoryview(b) for b in decode_pool]
+                decode_i = 0
 
             # progress tracking
+            decode_buf = decode_pool[decode_i]
             buf_p = ct.cast(buf, ct.c_void_p)
             decbuf_p = ct.cast(decode_buf, ct.c_void_p)
             to_decode.value = readlen
@@ -232,8 +293,8 @@ class SBCDecoder:
             while to_decode.value > 0:
                 written.value = 0
 
-                decoded = self._libsbc.sbc_decode(
-                    ct.byref(self._sbc),
+                decoded = sbc_decode(
+                    sbc_ref,
                     buf_p,
                     to_decode,
                     decbuf_p,
@@ -241,8 +302,7 @@ class SBCDecoder:
                     ct.byref(written))
 
                 if decoded <= 0:
-                    logger.debug("SBC decoding error - decoded={}".format(
-                        decoded))
+                    logger.debug("SBC decoding error - decoded=%s", decoded)
                     break # make do with what we have
                 
                 # update buffer pointers / counters
@@ -253,11 +313,17 @@ class SBCDecoder:
                 to_write.value -= written.value
                 total_written += written.value
 
-            # hand over decoded data on the main thread
+            # hand over decoded data on the main thread as a zero-copy view;
+            # the callback must consume it synchronously
+            # note: positional args straight through add_callback, so no
+            # per-packet partial object or kwargs dict
             if self.on_data_ready:
-                self.ioloop.add_callback(partial(
+                add_callback(
                     self.on_data_ready,
-                    data=decode_buf.raw[0:total_written]))
+                    decode_views[decode_i][:total_written])
+                decode_i = (decode_i + 1) & 3
+
+        sel.close()
 
     def _populate_sbct(self, data):
         """Returns a sbc_t instance based on provided RTP packet that contains
@@ -1,14 +1,21 @@
 
-from datetime import datetime, timedelta
 import logging
 
 import alsaaudio
 from tornado.ioloop import IOLoop
 
+from pytooth.other.audio import apply_gain
 from pytooth.other.buffers import ThreadSafeMemoryBuffer
 
 logger = logging.getLogger(__name__)
 
+# decoder sample size -> ALSA format constant, resolved once at import
+# instead of a getattr on a freshly formatted name per stream
+ALSA_FORMATS = {
+    8: alsaaudio.PCM_FORMAT_S8,
+    16: alsaaudio.PCM_FORMAT_S16_LE
+}
+
 
 class AlsaAudioSink:
     """Drives an A2DP decoder and writes the resulting PCM samples to an
@@ -25,6 +32,10 @@ class AlsaAudioSink:
         # events
         self.on_fatal_error = None
 
+        # digital gain applied to playback samples; 1.0 is pass-through
+        # and costs nothing
+        self.gain = 1.0
+
         # other
         self.ioloop = IOLoop.current()
         self._device_name = device_name
@@ -57,7 +68,7 @@ class AlsaAudioSink:
         self._decoder.stop()
 
         # cleanup ALSA device
-        if not self._device:
+        if self._device:
             self._device.close()
             self._device = None
         
@@ -70,22 +81,25 @@ class AlsaAudioSink:
             return
 
         if not self._pcm_format_set:
-            logger.debug("PCM format not set - ignoring {} bytes.".format(
-                len(data)))
+            logger.debug("PCM format not set - ignoring %s bytes.",
+                len(data))
             return
 
         if self._device is None:
-            logger.debug("ALSA device not opened - ignoring {} bytes.".format(
-                len(data)))
+            logger.debug("ALSA device not opened - ignoring %s bytes.",
+                len(data))
             return
 
+        # note: the gain kernel only understands 16-bit samples
+        if self.gain != 1.0 and self._decoder.sample_size == 16:
+            data = apply_gain(data, self.gain)
         self._device.write(data)
 
     def _fatal_decoder_error(self, error):
         """Called when a fatal decoder error occurs. The decoder automatically
         stops.
         """
-        logger.critical("Fatal decoder error - {}".format(error))
+        logger.critical("Fatal decoder error - %s", error)
         self.stop()
         if self.on_fatal_error:
             self.on_fatal_error(error)
@@ -96,16 +110,20 @@ class AlsaAudioSink:
         if not self._started:
             return
 
-        logger.debug("PCM format ready - Channels={}, Rate={}, BitsPerSample={}".format(
+        logger.debug("PCM format ready - Channels=%s, Rate=%s, "
+            "BitsPerSample=%s",
             self._decoder.channel_mode,
             self._decoder.sample_rate,
-            self._decoder.sample_size))
-        alsa_format = "PCM_FORMAT_S{}_LE".format(self._decoder.sample_size)
-        logger.debug("ALSA format const = {}".format(alsa_format))
+            self._decoder.sample_size)
 
         # open the ALSA device
+        # note: a KeyError here means the decoder negotiated a sample size
+        # we have no ALSA format for
         self._device = alsaaudio.PCM(alsaaudio.PCM_PLAYBACK, device=self._device_name)
         self._device.setchannels(self._decoder.channels)
         self._device.setrate(self._decoder.sample_rate)
-        self._device.setformat(getattr(alsaaudio, alsa_format))
+        self._device.setformat(ALSA_FORMATS[self._decoder.sample_size])
+        # 20 ms periods; the default driver-chosen period can be large
+        # enough to cause startup underruns before the buffer fills
+        self._device.setperiodsize(self._decoder.sample_rate // 50)
         self._pcm_format_set = True
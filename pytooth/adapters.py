@@ -129,8 +129,13 @@ class BaseAdapter:
             raise InvalidOperationError("No suitable adapter available.")
             
         try:
-            self._adapter_proxy.set("Discoverable", enabled)
-            self._adapter_proxy.set("DiscoverableTimeout", UInt32(timeout or 0))
+            # both writes go onto the bus back-to-back without waiting on
+            # either reply, so adapter churn does not stall the ioloop
+            self._adapter_proxy.set_async(
+                "Discoverable", enabled, self._set_property_error)
+            self._adapter_proxy.set_async(
+                "DiscoverableTimeout", UInt32(timeout or 0),
+                self._set_property_error)
         except Exception as e:
             raise CommandError(e)
 
@@ -145,11 +150,44 @@ class BaseAdapter:
             raise InvalidOperationError("No suitable adapter available.")
 
         try:
-            self._adapter_proxy.set("Pairable", enabled)
-            self._adapter_proxy.set("PairableTimeout", UInt32(timeout or 0))
+            self._adapter_proxy.set_async(
+                "Pairable", enabled, self._set_property_error)
+            self._adapter_proxy.set_async(
+                "PairableTimeout", UInt32(timeout or 0),
+                self._set_property_error)
         except Exception as e:
             raise CommandError(e)
 
+    def set_visibility(self, discoverable, pairable, timeout=None):
+        """Sets discoverable and pairable status in one call. All four
+        property writes are dispatched back-to-back without waiting on
+        replies. Timeout is in seconds, or pass None for no timeout.
+        """
+
+        if not self._started:
+            raise InvalidOperationError("Not started.")
+        if not self._connected:
+            raise InvalidOperationError("No suitable adapter available.")
+
+        try:
+            self._adapter_proxy.set_async(
+                "Discoverable", discoverable, self._set_property_error)
+            self._adapter_proxy.set_async(
+                "DiscoverableTimeout", UInt32(timeout or 0),
+                self._set_property_error)
+            self._adapter_proxy.set_async(
+                "Pairable", pairable, self._set_property_error)
+            self._adapter_proxy.set_async(
+                "PairableTimeout", UInt32(timeout or 0),
+                self._set_property_error)
+        except Exception as e:
+            raise CommandError(e)
+
+    def _set_property_error(self, error):
+        """DBus callback for a failed asynchronous property write.
+        """
+        logger.error("Error setting adapter property - {}".format(error))
+
     def _find_suitable_adapter(self):
         """Searches for a suitable adapter based on preferred address or
         'best available'. Executes repeatedly until an adapter is found.
@@ -173,7 +173,21 @@ class MediaTransport:
         self._fd, self._read_mtu, self._write_mtu = \
             self._proxy.proxy.TryAcquire()
         self._fd = self._fd.take()
-        self._socket = socket.socket(fileno=self._fd)
+        # the transport is an L2CAP SEQPACKET fd; passing the family/type/
+        # protocol explicitly saves the three getsockopt() calls Python
+        # otherwise makes to rediscover them from the fd
+        self._socket = socket.socket(
+            socket.AF_BLUETOOTH,
+            socket.SOCK_SEQPACKET,
+            socket.BTPROTO_L2CAP,
+            fileno=self._fd)
+        # a roomy kernel buffer stops bluez stalling the stream if the
+        # decoder briefly falls behind (best-effort)
+        try:
+            self._socket.setsockopt(
+                socket.SOL_SOCKET, socket.SO_RCVBUF, 65536)
+        except OSError:
+            pass
         logger.debug("Successfully acquired OS file descriptor - fd={}, "
             "readMTU={}, writeMTU={}".format(
                 self._fd, self._read_mtu, self._write_mtu))
@@ -340,7 +354,27 @@ class PhonebookClient:
         if self._transfer is not None:
             return
 
-        self._client.proxy.Select(location, name)
+        # fire-and-forget: Select returns no data, so there is no reason
+        # to hold the caller for a full DBus round-trip; the bus keeps
+        # message order, so a get_all() issued straight after still runs
+        # against the selected phonebook, and a failure surfaces on that
+        # transfer anyway
+        self._client.proxy.Select(
+            location,
+            name,
+            reply_handler=self._select_done,
+            error_handler=self._select_error)
+
+    def _select_done(self):
+        """DBus callback for a completed Select call.
+        """
+        pass
+
+    def _select_error(self, error):
+        """DBus callback for a failed Select call.
+        """
+        logger.error("Obex Select on '{}' failed - {}".format(
+            self._destination, error))
 
     def get_all(self, fmt=None, order=None, offset=None, maxcount=None, \
         fields=None):
@@ -423,7 +457,11 @@ class Profile(dbus.service.Object):
         if self.on_connect:
             self.on_connect(
                 device=device,
-                socket=socket.socket(fileno=fd),
+                socket=socket.socket(
+                    socket.AF_BLUETOOTH,
+                    socket.SOCK_STREAM,
+                    socket.BTPROTO_RFCOMM,
+                    fileno=fd),
                 fd_properties=fd_properties)
 
     @dbus.service.method(dbus_interface=Bluez5Utils.PROFILE_INTERFACE,
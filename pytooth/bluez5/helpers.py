@@ -69,6 +69,22 @@ class DBusProxy:
     def set(self, name, value):
         self._props.Set(self._interface, name, value)
 
+    def set_async(self, name, value, error_handler):
+        """Sets a property without waiting for the reply. The error handler
+        is invoked with the DBus error if the write fails.
+        """
+        self._props.Set(
+            self._interface,
+            name,
+            value,
+            reply_handler=_set_reply,
+            error_handler=error_handler)
+
+def _set_reply():
+    """DBus callback for a completed asynchronous property write.
+    """
+    pass
+
 class Bluez5Utils:
     """Provides some helpful utility functions for interacting with bluez5.
     """
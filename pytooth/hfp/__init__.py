@@ -89,6 +89,14 @@ class HandsFreeProfile:
         self._adapter.set_pairable(
             enabled=enabled,
             timeout=timeout)
+
+    def set_visibility(self, discoverable, pairable, timeout=None):
+        """Set discoverable and pairable status in one call.
+        """
+        self._adapter.set_visibility(
+            discoverable=discoverable,
+            pairable=pairable,
+            timeout=timeout)
     
     def _adapter_connected_changed(self, adapter, connected):
         """Adapter connected or disconnected.
@@ -189,6 +189,9 @@ class SerialPortConnection:
         #   "future": <future>
         #   "handle": <timeout handle>]
         self._reply_q = defaultdict(list)
+        # message -> encoded line, as the same small set of AT commands is
+        # sent over and over
+        self._encoded_cache = {}
         self._socket = socket
         
         self.on_close = None
@@ -222,12 +225,12 @@ class SerialPortConnection:
     def _data_ready(self, data):
         """Parses data that has been received over the serial connection.
         """
-        logger.debug("Received {} bytes from AG over SPC - {}".format(
-            len(data), data))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Received %s bytes from AG over SPC - %s",
+                len(data), data)
         if len(self._remainder) > 0:
             data = self._remainder + data
-            logger.debug("Appended left-over bytes - {}".format(
-                self._remainder))
+            logger.debug("Appended left-over bytes - %s", self._remainder)
         
         while True:
             # all AG -> HF messages are <cr><lf> delimited
@@ -388,9 +391,10 @@ class SerialPortConnection:
         # ("roam",(0,1)),("battchg",(0-5)),("callheld",(0-2))
         if "(" in params:
             params = ast.literal_eval(params)
-            self._indmap = dict([
-                (i, name) for i, (name, _) in enumerate(params)])
-            return [name for name, _ in params]
+            # positional table - CIEV updates arrive keyed by slot index, so
+            # lookup is a single list index
+            self._indmap = [name for name, _ in params]
+            return list(self._indmap)
 
         # ...or initial indicator values
         # 0,0,1,4,0,3,0
@@ -436,9 +440,17 @@ class SerialPortConnection:
         """
 
         try:
-            logger.debug("Sending \"{}\" over SPC.".format(message))
-            data = message+"\x0a"
-            self._stream.write(data.encode("ascii"))
+            logger.debug("Sending \"%s\" over SPC.", message)
+            if isinstance(message, bytes):
+                # pre-encoded command (usually with a variable suffix); no
+                # point caching these as the suffix varies per call
+                data = message + b"\x0a"
+            else:
+                data = self._encoded_cache.get(message)
+                if data is None:
+                    data = (message+"\x0a").encode("ascii")
+                    self._encoded_cache[message] = data
+            self._stream.write(data)
         except Exception as e:
             logger.exception("Error sending \"{}\" over SPC.".format(
                 message))
@@ -4,7 +4,8 @@
 from functools import partial
 import logging
 import select
-from socket import AF_BLUETOOTH, BTPROTO_SCO, SOCK_SEQPACKET, socket
+from socket import AF_BLUETOOTH, BTPROTO_SCO, MSG_PEEK, SOCK_SEQPACKET, \
+                    socket
 
 from dbus import UInt16
 from tornado.ioloop import IOLoop
@@ -147,6 +148,13 @@ class MediaManager:
     def __init__(self):
         # adapter to socket map
         self._connections = {} # adapter: {socket}
+        self._defer_setup = False
+
+        # one epoll instance tracks every established socket, so close
+        # detection costs a single syscall regardless of adapter count
+        self._epoll = select.epoll()
+        self._fd_to_adapter = {}
+        self._close_check_pending = False
 
         self.io_loop = IOLoop.instance()
 
@@ -171,20 +179,21 @@ class MediaManager:
 
         # attempt to create listening socket
         try:
+            sock, fd = self._sco_listen(adapter)
             self._connections[adapter] = {
-                "socket": self._sco_listen(adapter),
+                "socket": sock,
+                "listen_fd": fd,
                 "status": "listening"
             }
         except Exception as e:
             logger.exception("Failed to make SCO listen socket on adapter {}"
                 "".format(adapter))
-            if self.on_media_setup_error:
-                self.on_media_setup_error(
-                    adapter=adapter,
-                    error="Failed to make SCO listen socket - {}".format(e))
+            self._sco_setup_failed(
+                adapter=adapter,
+                sock=None,
+                error="Failed to make SCO listen socket - {}".format(e))
             return
-        logger.debug("Listening for SCO connection on adapter {}".format(
-            adapter))
+        logger.debug("Listening for SCO connection on adapter %s", adapter)
 
     def stop(self, adapter):
         """Stops listening or closes media connection via specified adapter. If
@@ -205,6 +214,14 @@ class MediaManager:
             sock = socket(AF_BLUETOOTH, SOCK_SEQPACKET, BTPROTO_SCO)
             sock.setblocking(0)
             sock.bind(adapter.address.encode())
+            # ask the kernel to defer codec setup until we have validated the
+            # connection, so a rejected peer never gets an audio channel
+            try:
+                sock.setsockopt(274, 7, 1) # SOL_BLUETOOTH, BT_DEFER_SETUP
+                self._defer_setup = True
+            except Exception:
+                logger.debug("BT_DEFER_SETUP not supported by this kernel.")
+                self._defer_setup = False
             sock.listen(1)
         except Exception:
             if sock:
@@ -212,33 +229,53 @@ class MediaManager:
             raise
 
         # connection accepter
+        # note: cache the fd as fileno() returns -1 once the socket is closed,
+        #       which makes remove_handler() silently misbehave
+        fd = sock.fileno()
         self.io_loop.add_handler(
-            sock.fileno(),
+            fd,
             partial(self._sco_connection_ready, adapter=adapter),
             IOLoop.READ)
 
-        return sock
+        return sock, fd
 
     def _sco_close(self, adapter):
         """Helper to close a listening or established SCO socket.
         """
         try:
             sock = self._connections[adapter]["socket"]
-            ep = self._connections[adapter].get("epoll")
-            if ep:
-                #ep.unregister(sock)
-                ep.close()
+            fd = self._connections[adapter].get("fd")
+            if fd is not None:
+                try:
+                    self._epoll.unregister(fd)
+                except Exception:
+                    pass
+                self._fd_to_adapter.pop(fd, None)
             if self._connections[adapter]["status"] == "listening":
-                self.io_loop.remove_handler(sock.fileno())
+                self.io_loop.remove_handler(
+                    self._connections[adapter]["listen_fd"])
             sock.close()
-            logger.debug("Successfully closed listening SCO socket on adapter "
-                "{}".format(adapter))
+            logger.debug("Successfully closed listening SCO socket on "
+                "adapter %s", adapter)
         except KeyError:
-            logger.warning("Ignored SCO close attempt for adapter {} as it is "
-                "not being tracked.".format(adapter))
+            logger.warning("Ignored SCO close attempt for adapter %s as it is "
+                "not being tracked.", adapter)
         except Exception:
-            logger.exception("SCO socket close error for adapter {}".format(
-                adapter))
+            logger.exception("SCO socket close error for adapter %s", adapter)
+
+    def _sco_setup_failed(self, adapter, sock, error):
+        """Helper to close a partially set-up SCO socket (if any) and announce
+        the error via the on_media_setup_error event.
+        """
+        if sock is not None:
+            try:
+                sock.close()
+            except Exception:
+                pass
+        if self.on_media_setup_error:
+            self.on_media_setup_error(
+                adapter=adapter,
+                error=error)
 
     def _sco_connection_ready(self, fd, events, adapter):
         """Callback for a new SCO connection.
@@ -248,68 +285,80 @@ class MediaManager:
         try:
             (sock, peer) = self._connections[adapter]["socket"].accept()
         except Exception as e:
-            logger.exception("SCO socket accept error for adapter {}".format(
-                adapter))
-            if self.on_media_setup_error:
-                self.on_media_setup_error(
-                    adapter=adapter,
-                    error="SCO socket accept error - {}".format(e))
+            logger.exception("SCO socket accept error for adapter %s", adapter)
+            self._sco_setup_failed(
+                adapter=adapter,
+                sock=None,
+                error="SCO socket accept error - {}".format(e))
             return
-        
+
         # get SCO MTU
         try:
             mtu = sock.getsockopt(17, 1)
-            logger.debug("SCO MTU for adapter {} = {}".format(adapter, mtu))
+            logger.debug("SCO MTU for adapter %s = %s", adapter, mtu)
         except Exception as e:
-            logger.exception("SCO MTU retrieve error for adapter {}".format(
-                adapter))
-            sock.close()
-            if self.on_media_setup_error:
-                self.on_media_setup_error(
-                    adapter=adapter,
-                    error="SCO MTU retrieve error - {}".format(e))
+            logger.exception("SCO MTU retrieve error for adapter %s", adapter)
+            self._sco_setup_failed(
+                adapter=adapter,
+                sock=sock,
+                error="SCO MTU retrieve error - {}".format(e))
             return
 
         # check CVSD mode is good
         # note: this will need altering if we add support for mSBC
         try:
             mode = sock.getsockopt(274, 11)
-            logger.debug("CVSD sample format ID for adapter {} = {}".format(
-                adapter, mode))
+            logger.debug("CVSD sample format ID for adapter %s = %s",
+                adapter, mode)
             if mode != 96: # 16-bit signed LE samples
-                if self.on_media_setup_error:
-                    self.on_media_setup_error(
-                        adapter=adapter,
-                        error="Unsupported CVSD sample format - {}"
-                            ", 16-bit signed LE required.".format(mode))
+                self._sco_setup_failed(
+                    adapter=adapter,
+                    sock=sock,
+                    error="Unsupported CVSD sample format - {}"
+                        ", 16-bit signed LE required.".format(mode))
                 return
         except Exception as e:
-            logger.exception("CVSD sample format ID retrieve error for adapter "
-                "{}".format(adapter))
-            sock.close()
-            if self.on_media_setup_error:
-                self.on_media_setup_error(
-                    adapter=adapter,
-                    error="CVSD sample format ID retrieve error - {}".format(e))
+            logger.exception("CVSD sample format ID retrieve error for "
+                "adapter %s", adapter)
+            self._sco_setup_failed(
+                adapter=adapter,
+                sock=sock,
+                error="CVSD sample format ID retrieve error - {}".format(e))
             return
 
+        # validation passed, so complete the deferred codec setup by reading
+        # (but not consuming) a single byte
+        if self._defer_setup:
+            try:
+                sock.recv(1, MSG_PEEK)
+            except Exception as e:
+                logger.exception("SCO deferred setup error for adapter %s",
+                    adapter)
+                self._sco_setup_failed(
+                    adapter=adapter,
+                    sock=sock,
+                    error="SCO deferred setup error - {}".format(e))
+                return
+
         # close listening socket and remember established one
         self._connections[adapter]["socket"].close()
+        conn_fd = sock.fileno()
         self._connections[adapter] = {
             "socket": sock,
+            "fd": conn_fd,
             "status": "connected"
         }
 
-        # connection close detection
-        ep = select.epoll()
-        ep.register(sock, select.EPOLLERR | select.EPOLLHUP)
-        self._connections[adapter]["epoll"] = ep
-        self.io_loop.add_callback(
-            callback=partial(self._sco_close_check, adapter=adapter))
+        # connection close detection via the shared epoll instance
+        self._epoll.register(conn_fd, select.EPOLLERR | select.EPOLLHUP)
+        self._fd_to_adapter[conn_fd] = adapter
+        if not self._close_check_pending:
+            self._close_check_pending = True
+            self.io_loop.add_callback(callback=self._sco_close_check)
 
         # can finally safely announce new connection
-        logger.info("SCO connection established by peer {} for adapter {}".format(
-            peer, adapter))
+        logger.info("SCO connection established by peer %s for adapter %s",
+            peer, adapter)
 
         if self.on_media_connected_changed:
             self.on_media_connected_changed(
@@ -319,31 +368,30 @@ class MediaManager:
                 mtu=mtu,
                 peer=peer)
 
-    def _sco_close_check(self, adapter):
-        """Constantly called to check if an established SCO socket has closed.
+    def _sco_close_check(self):
+        """Constantly called to check if any established SCO socket has closed.
+        One timer and one poll syscall cover all tracked adapters.
         """
+        self._close_check_pending = False
 
-        # if stop() was called, the adapter won't be tracked, so stop checking
-        if adapter not in self._connections:
+        # if stop() was called, no sockets are tracked, so stop checking
+        if not self._fd_to_adapter:
             return
 
-        ep = self._connections[adapter]["epoll"]
-        sock = self._connections[adapter]["socket"]
-        closed = False
-
         try:
             # timeout of 0 means no blocking
-            result = ep.poll(1.0)
-            closed = len(result) != 0
+            closed_fds = [fd for fd, _ in self._epoll.poll(0)]
         except Exception as e:
-            # assuming any error with the socket is a close
-            logger.error("EPOLL error in _sco_close_check() - {}".format(
-                e))
-            closed = True
-
-        if closed:
-            logger.info("Established SCO socket closed for adapter {}.".format(
-                adapter))
+            # assuming any error with the epoll is a close of everything
+            logger.error("EPOLL error in _sco_close_check() - %s", e)
+            closed_fds = list(self._fd_to_adapter)
+
+        for fd in closed_fds:
+            adapter = self._fd_to_adapter.get(fd)
+            if adapter is None:
+                continue
+            logger.info("Established SCO socket closed for adapter %s.",
+                adapter)
             # stop tracking and alert
             self.stop(adapter=adapter)
             if self.on_media_connected_changed:
@@ -353,9 +401,10 @@ class MediaManager:
                     socket=None,
                     mtu=None,
                     peer=None)
-        else:
-            # keep checking
+
+        # keep checking while any socket remains
+        if self._fd_to_adapter:
+            self._close_check_pending = True
             self.io_loop.call_later(
                 delay=1,
-                callback=self._sco_close_check,
-                adapter=adapter)
+                callback=self._sco_close_check)
@@ -1,7 +1,7 @@
 
 import logging
 
-from tornado.gen import coroutine
+from tornado.gen import coroutine, multi
 
 from pytooth.errors import InvalidOperationError
 from pytooth.hfp.constants import HF_BRSF_FEATURES
@@ -9,6 +9,14 @@ from pytooth.hfp.helpers import CallStateMachine
 
 logger = logging.getLogger(__name__)
 
+# precomposed at import time since the feature mask is a constant
+_AT_BRSF = "AT+BRSF={}".format(HF_BRSF_FEATURES)
+
+# pre-encoded prefixes for the commands that carry a variable suffix,
+# skipping the str build + encode round-trip on the dial/DTMF path
+_ATD = b"ATD"
+_AT_VTS = b"AT+VTS="
+
 
 class RemotePhone:
     """Acts as a proxy to a remote AG (Audio Gateway). It handles the initial
@@ -16,6 +24,11 @@ class RemotePhone:
     methods for performing actions on the AG.
     """
 
+    # readiness states, ordered so the guard is one integer compare
+    _NOT_STARTED = 0
+    _HANDSHAKING = 1
+    _READY = 2
+
     def __init__(self, connection, io_loop):
         # serial connection helper
         self._connection = connection
@@ -32,25 +45,24 @@ class RemotePhone:
         self._ag_multicall = None
         self._codec = None
         self._csm = None
-        self._handshake_completed = False
         self.io_loop = io_loop
-        self._started = False
+        self._state = RemotePhone._NOT_STARTED
 
     def start(self):
         """Kicks off handshake. Should only be called by HandsFreeProfile
         object.
         """
-        if self._started:
+        if self._state != RemotePhone._NOT_STARTED:
             return
 
         self._csm = CallStateMachine()
         self.io_loop.add_callback(self._do_handshake)
-        self._started = True
+        self._state = RemotePhone._HANDSHAKING
 
     @property
     def call_state(self):
         """Current state of calls present on the AG telephony device."""
-        if not self._started:
+        if self._state == RemotePhone._NOT_STARTED:
             return None
         return self._csm.state
 
@@ -82,10 +94,7 @@ class RemotePhone:
         returns no value. State changes resulting from this function are
         available via the on_event() event.
         """
-        if not self._started:
-            raise InvalidOperationError("Not started.")
-        if not self._handshake_completed:
-            raise InvalidOperationError("Handshake not completed.")
+        self._require_ready()
 
         self._connection.send_message(message="ATA")
 
@@ -95,13 +104,10 @@ class RemotePhone:
         returns no value. State changes resulting from this function are
         available via the on_event() event.
         """
-        if not self._started:
-            raise InvalidOperationError("Not started.")
-        if not self._handshake_completed:
-            raise InvalidOperationError("Handshake not completed.")
+        self._require_ready()
 
         self._connection.send_message(
-            message="ATD{}".format(number))
+            message=_ATD + str(number).encode("ascii"))
 
     def hangup(self):
         """Request to hangup a connected call. This function raises an
@@ -109,10 +115,7 @@ class RemotePhone:
         returns no value. State changes resulting from this function are
         available via the on_event() event.
         """
-        if not self._started:
-            raise InvalidOperationError("Not started.")
-        if not self._handshake_completed:
-            raise InvalidOperationError("Handshake not completed.")
+        self._require_ready()
 
         self._connection.send_message(message="AT+CHUP")
 
@@ -122,10 +125,7 @@ class RemotePhone:
         returns no value. State changes resulting from this function are
         available via the on_event() event.
         """
-        if not self._started:
-            raise InvalidOperationError("Not started.")
-        if not self._handshake_completed:
-            raise InvalidOperationError("Handshake not completed.")
+        self._require_ready()
 
         self._connection.send_message(message="AT+CHUP")
 
@@ -135,13 +135,20 @@ class RemotePhone:
         returns no value. State changes resulting from this function are
         available via the on_event() event.
         """
-        if not self._started:
-            raise InvalidOperationError("Not started.")
-        if not self._handshake_completed:
-            raise InvalidOperationError("Handshake not completed.")
+        self._require_ready()
 
         self._connection.send_message(
-            message="AT+VTS={}".format(dtmf))
+            message=_AT_VTS + str(dtmf).encode("ascii"))
+
+    def _require_ready(self):
+        """Raises InvalidOperationError unless started and the handshake has
+        completed.
+        """
+        s = self._state
+        if s != RemotePhone._READY:
+            raise InvalidOperationError(
+                "Not started." if s == RemotePhone._NOT_STARTED
+                else "Handshake not completed.")
 
     def _connection_close(self):
         """Called when serial connection is closed.
@@ -158,29 +165,64 @@ class RemotePhone:
     def _connection_message(self, code, data):
         """Called when AG sends us a non-error message.
         """
-        logger.debug("RFCOMM message received: {}{}".format(
-            code, " - {}".format(data) if data else ""))
-
-        # indicator update or initial values
-        if code in ["CIEV", "CIND"] and isinstance(data, dict):
-            if "battchg" in data:
-                self._raise_event(name="battery", level=int(data["battchg"]))
-            if "roam" in data:
-                self._raise_event(name="roaming", roaming=data["roam"] == '1')
-            if "service" in data:
-                self._raise_event(name="service", service=data["service"] == '1')
-            if "signal" in data:
-                self._raise_event(name="signal", level=int(data["signal"]))
-
-        # carrier
-        if code == "COPS":
-            self._raise_event(name="carrier", carrier=data["name"])
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("RFCOMM message received: %s%s",
+                code, " - {}".format(data) if data else "")
+
+        # dispatch via the precompiled handler table
+        handler = self._CODE_HANDLERS.get(code)
+        if handler:
+            handler(self, data)
 
         # call state machine
         transitioned = self._csm.transition(name=code, data=data)
         if transitioned:
             self._raise_event(name="calls", state=self._csm.state)
 
+    def _message_indicators(self, data):
+        """Indicator update (CIEV) or initial indicator values (CIND).
+        """
+        if not isinstance(data, dict):
+            return
+        # CIEV updates carry a single indicator, so walk the payload rather
+        # than testing every known indicator name against it
+        for ind, value in data.items():
+            emit = self._IND_HANDLERS.get(ind)
+            if emit:
+                emit(self, value)
+
+    def _message_carrier(self, data):
+        """Network operator query response (COPS).
+        """
+        self._raise_event(name="carrier", carrier=data["name"])
+
+    def _emit_battery(self, value):
+        self._raise_event(name="battery", level=int(value))
+
+    def _emit_roaming(self, value):
+        self._raise_event(name="roaming", roaming=value == '1')
+
+    def _emit_service(self, value):
+        self._raise_event(name="service", service=value == '1')
+
+    def _emit_signal(self, value):
+        self._raise_event(name="signal", level=int(value))
+
+    # built once, so the per-message path is a dict lookup instead of a
+    # chain of string comparisons
+    _CODE_HANDLERS = {
+        "CIEV": _message_indicators,
+        "CIND": _message_indicators,
+        "COPS": _message_carrier
+    }
+
+    _IND_HANDLERS = {
+        "battchg": _emit_battery,
+        "roam": _emit_roaming,
+        "service": _emit_service,
+        "signal": _emit_signal
+    }
+
     @coroutine
     def _do_handshake(self):
         """Performs a handshake with the AG according to the spec, plus a few
@@ -192,7 +234,7 @@ class RemotePhone:
 
             # features
             self._ag_features = yield self._send_and_wait(
-                "AT+BRSF={}".format(HF_BRSF_FEATURES),
+                _AT_BRSF,
                 "BRSF")
             logger.debug("AG feature set = {}".format(self._ag_features))
 
@@ -213,20 +255,20 @@ class RemotePhone:
             yield self._send_and_wait("AT+CMER=3,0,0,1", "OK")
 
             # specific to call wait/3-way
+            batch = []
             if self._ag_features["3WAY"]:
                 self._ag_multicall = yield self._send_and_wait(
                     "AT+CHLD=?", "CHLD")
                 # call waiting alerts
-                yield self._send_and_wait("AT+CCWA=1", "OK")
-                
-            # extended error handling
-            yield self._send_and_wait("AT+CMEE=1", "OK")
-
-            # CLI
-            yield self._send_and_wait("AT+CLIP=1", "OK")
-
-            # network operator format
-            yield self._send_and_wait("AT+COPS=3,0", "OK")
+                batch.append(self._send_and_wait("AT+CCWA=1", "OK"))
+
+            # the remaining commands are independent of each other, so
+            # pipeline them in one batch instead of serial round-trips
+            # (extended error handling, CLI, network operator format)
+            batch.append(self._send_and_wait("AT+CMEE=1", "OK"))
+            batch.append(self._send_and_wait("AT+CLIP=1", "OK"))
+            batch.append(self._send_and_wait("AT+COPS=3,0", "OK"))
+            yield multi(batch)
             self._connection.send_message("AT+COPS?")
 
         except TimeoutError as e:
@@ -236,7 +278,7 @@ class RemotePhone:
             return
 
         # handshake is complete
-        self._handshake_completed = True
+        self._state = RemotePhone._READY
         logger.debug("HFP handshake is complete.")
         if self.on_connected_changed:
             self.on_connected_changed(connected=True)
@@ -248,7 +290,7 @@ class RemotePhone:
         response = yield self._connection.send_message(
             message=command,
             async_reply_code=reply_code)
-        logger.debug("{} response = {}".format(command, response))
+        logger.debug("%s response = %s", command, response)
         return response
 
     def _raise_event(self, name, **kwargs):
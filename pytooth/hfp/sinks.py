@@ -1,15 +1,72 @@
 
-from datetime import datetime, timedelta
 import logging
+import os
+from threading import Event, Thread
+from time import monotonic
 
 import alsaaudio
 from tornado.ioloop import IOLoop
 
-from pytooth.other.buffers import ThreadSafeMemoryBuffer
+from pytooth.other.audio import apply_gain
+from pytooth.other.buffers import SpscByteBuffer
 
 logger = logging.getLogger(__name__)
 
 
+class _JitterController:
+    """Tracks packet arrival jitter and derives the playback prefetch
+    target, Speex-style: a smoothed (EWMA) jitter estimate is mapped to a
+    target buffer depth between a minimum and maximum, and underruns bump
+    the target one step rather than triggering a long fixed re-prime.
+    """
+
+    _MIN_MS = 40
+    _MAX_MS = 500
+    _STEP_MS = 20
+
+    def __init__(self, byte_rate):
+        self._byte_rate = byte_rate
+        self._floor_ms = _JitterController._MIN_MS
+        self._gap_ewma = None
+        self._jitter_ewma = 0.0
+        self._last_arrival = None
+        self.target_ms = _JitterController._MIN_MS
+
+    @property
+    def target_bytes(self):
+        return int(self.target_ms / 1000 * self._byte_rate)
+
+    def on_data(self, now):
+        """Updates the jitter estimate from the arrival time of a packet.
+        Returns the milliseconds elapsed since the previous packet, or None
+        for the first one.
+        """
+        gap = None
+        if self._last_arrival is not None:
+            gap = (now - self._last_arrival) * 1000
+            if self._gap_ewma is None:
+                self._gap_ewma = gap
+            self._jitter_ewma = \
+                0.9 * self._jitter_ewma + 0.1 * abs(gap - self._gap_ewma)
+            self._gap_ewma = 0.9 * self._gap_ewma + 0.1 * gap
+            # interpolate the target for jitter in the 5-15 ms band
+            frac = min(1.0, max(
+                0.0, (self._jitter_ewma - 5.0) / 10.0))
+            derived = _JitterController._MIN_MS + frac * \
+                (_JitterController._MAX_MS - _JitterController._MIN_MS)
+            self.target_ms = max(self._floor_ms, derived)
+        self._last_arrival = now
+        return gap
+
+    def bump(self):
+        """Raises the minimum target one step in response to an underrun.
+        """
+        self._floor_ms = min(
+            self._floor_ms + _JitterController._STEP_MS,
+            _JitterController._MAX_MS)
+        self.target_ms = max(self._floor_ms, self.target_ms)
+
+
 class AlsaAudioSink:
     """Gets fed PCM samples from a socket pump and writes the data to an
     Alsa device.
@@ -20,10 +77,14 @@ class AlsaAudioSink:
         self._socket_pump = socket_pump
         self._socket_pump.on_data_ready = self._data_ready
         self._socket_pump.on_fatal_error = self._fatal_pump_error
-        
+
         # events
         self.on_fatal_error = None
 
+        # digital gain applied to playback samples; 1.0 is pass-through
+        # and costs nothing
+        self.gain = 1.0
+
         # other
         self.ioloop = IOLoop.current()
         self._device_name = device_name
@@ -41,7 +102,26 @@ class AlsaAudioSink:
         self._device.setchannels(1)
         self._device.setrate(8000)
         self._device.setformat(alsaaudio.PCM_FORMAT_S16_LE)
+        # 20 ms periods to match the writer's chunking; the default
+        # driver-chosen period can be large enough to cause startup
+        # underruns before the buffer fills
+        self._device.setperiodsize(160)
+        # adaptive prefetch; 8 kHz mono 16-bit = 16000 bytes/sec
+        self._jitter = _JitterController(byte_rate=16000)
+        self._buffer = SpscByteBuffer(capacity=16000)
+        self._priming = True
+        # one preallocated 20 ms silence frame for gap concealment, so
+        # starvation never allocates on the writer thread
+        self._silence = bytes(320)
+        # ALSA writes can block for tens of ms, so they happen on a
+        # dedicated thread rather than the pump/ioloop thread
+        self._wake = Event()
+        self._worker = Thread(
+            target=self._do_write,
+            name="AlsaAudioSink",
+            daemon=True)
         self._started = True
+        self._worker.start()
 
     def stop(self):
         """Stops the sink. If already stopped, this does nothing.
@@ -50,9 +130,11 @@ class AlsaAudioSink:
             return
 
         self._started = False
-        
+        self._wake.set()
+        self._worker.join()
+
         # cleanup ALSA device
-        if not self._device:
+        if self._device:
             self._device.close()
             self._device = None
 
@@ -63,17 +145,98 @@ class AlsaAudioSink:
             return
 
         if self._device is None:
-            logger.debug("ALSA device not opened - ignoring {} bytes.".format(
-                len(data)))
+            logger.debug("ALSA device not opened - ignoring %s bytes.",
+                len(data))
             return
 
-        self._device.write(data)
+        # just queue the data and poke the writer thread; blocking in an
+        # ALSA write here would stall the ioloop
+        self._jitter.on_data(now=monotonic())
+        self._buffer.append(data)
+        # the prime flip happens here, on the arrival event, so writes
+        # resume the moment enough data exists rather than on the writer's
+        # next re-check
+        if self._priming and \
+                self._buffer.length >= self._jitter.target_bytes:
+            self._priming = False
+        self._wake.set()
+
+    def _do_write(self):
+        """Runs the writer in a try/catch just in case something goes wrong.
+        An unguarded exception would otherwise kill the thread silently and
+        leave the device playing out its last buffer.
+        """
+        try:
+            self._writer_loop()
+        except Exception as e:
+            # a stop() race tears the device from under us; only a failure
+            # while running is worth reporting
+            if self._started:
+                logger.exception("Unhandled sink write error.")
+                self.ioloop.add_callback(self.stop)
+                if self.on_fatal_error:
+                    self.ioloop.add_callback(self.on_fatal_error, e)
+
+    def _writer_loop(self):
+        """Drains the ring into the ALSA device in 20 ms chunks. Runs on a
+        dedicated thread, paced by the device's own blocking writes.
+        """
+        # realtime priority keeps device writes ahead of ordinary load;
+        # below the pump so the pump always wins the CPU (best-effort,
+        # needs CAP_SYS_NICE)
+        try:
+            os.sched_setscheduler(
+                0, os.SCHED_FIFO, os.sched_param(5))
+        except Exception:
+            logger.debug("Could not set realtime policy for sink writer.")
+
+        chunk = 320 # 20 ms at 8 kHz mono 16-bit
+        while self._started:
+
+            # hold writes back until the data callback flips the prime
+            # flag; the wake event makes the wait cost nothing
+            if self._priming:
+                if self._wake.wait(0.02):
+                    self._wake.clear()
+                continue
+
+            # an empty ring means the device is about to starve; bump the
+            # target one step and re-prime, instead of a costly fixed
+            # multi-second prefetch restart
+            data = self._buffer.get(chunk)
+            if not data:
+                self._jitter.bump()
+                logger.debug("Sink starved - raising target to %.0f ms.",
+                    self._jitter.target_ms)
+                self._priming = True
+                # conceal the gap with silence so the device keeps running
+                # instead of underrunning audibly while we re-prime
+                try:
+                    self._device.write(self._silence)
+                except alsaaudio.ALSAAudioError:
+                    pass
+                continue
+
+            # cap latency: if the backlog has grown well past the target,
+            # drop the oldest frames rather than playing them late
+            excess = self._buffer.length - \
+                (self._jitter.target_bytes + 2 * chunk)
+            if excess > 0:
+                logger.debug("Dropping %s stale sink bytes.", excess)
+                self._buffer.get(excess)
+
+            if self.gain != 1.0:
+                data = apply_gain(data, self.gain)
+            try:
+                self._device.write(data)
+            except alsaaudio.ALSAAudioError as e:
+                logger.error("ALSA write error - %s", e)
 
     def _fatal_pump_error(self, error):
         """Called when a fatal socket pump error occurs. The pump automatically
         stops.
         """
-        logger.error("Fatal socket pump error - {}".format(error))
+        logger.error("Fatal socket pump error - %s", error)
         self.stop()
         if self.on_fatal_error:
             self.on_fatal_error(error)
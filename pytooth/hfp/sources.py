@@ -1,7 +1,6 @@
 
-from datetime import timedelta
 import logging
-import select
+import os
 from threading import Thread
 from time import sleep
 
@@ -21,12 +20,19 @@ class AlsaAudioSource:
         self._socket_pump = socket_pump
         self._socket_pump.on_fatal_error = self._fatal_pump_error
 
+        # events
+        self.on_fatal_error = None
+
         # other
         self.ioloop = IOLoop.current()
-        self._deadline = None
         self._device_name = device_name
         self._mtu = mtu
         self._started = False
+        self._worker = None
+
+    @property
+    def mtu(self):
+        return self._mtu
 
     def start(self):
         """Starts the source. If already started, this does nothing.
@@ -34,19 +40,24 @@ class AlsaAudioSource:
         if self._started:
             return
 
-        # open the Alsa device
+        # open the Alsa device in blocking mode, so reads wake exactly when
+        # the driver has a period of samples ready - no timers or sleeps
         # note: CVSD support only
         self._device = alsaaudio.PCM(
             alsaaudio.PCM_CAPTURE,
-            alsaaudio.PCM_NONBLOCK,
             device=self._device_name)
         self._device.setchannels(1)
         self._device.setrate(8000)
         self._device.setformat(alsaaudio.PCM_FORMAT_S16_LE)
-        self._device.setperiodsize(2000) # 0.25 seconds buffer
-        self._deadline = timedelta(milliseconds=250)
+        # 20 ms periods: small enough that the driver never accumulates a
+        # backlog between reads, and each wakeup is one pump write
+        self._device.setperiodsize(160)
+        self._worker = Thread(
+            target=self._read_data,
+            name="AlsaAudioSource",
+            daemon=True)
         self._started = True
-        self.ioloop.add_callback(self._read_data)
+        self._worker.start()
 
     def stop(self):
         """Stops the source. If already stopped, this does nothing.
@@ -55,35 +66,70 @@ class AlsaAudioSource:
             return
 
         self._started = False
-        
+        self._worker.join()
+        self._worker = None
+
         # cleanup ALSA device
-        if not self._device:
+        if self._device:
             self._device.close()
             self._device = None
 
     def _read_data(self):
-        """Read as much data as is available from the ALSA device. This is
-        invoked at the same frequency as the buffer size specified in start().
+        """Reads periods of data from the ALSA device as the driver delivers
+        them. Runs in a dedicated thread until stopped.
         """
-        if not self._started:
-            return
-
+        # match the sink writer's realtime priority, so a capture stall
+        # cannot starve the uplink (best-effort, needs CAP_SYS_NICE)
         try:
-            l, data = self._device.read()
-            if l > 0:
-                self._socket_pump.write(data)
-        except Exception as e:
-            logger.error("ALSA read error - {}".format(e))
-
-        self.ioloop.add_timeout(
-            deadline=self._deadline,
-            callback=self._read_data)
-        
+            os.sched_setscheduler(
+                0, os.SCHED_FIFO, os.sched_param(5))
+        except Exception:
+            logger.debug("Could not set realtime policy for capture "
+                "reader.")
+
+        errors = 0
+        while self._started:
+            try:
+                # a blocking read returns as soon as a period is ready, and
+                # immediately again (no kernel wait) while the driver still
+                # holds queued periods - so scheduling hiccups drain in a
+                # burst instead of overrunning the capture ring
+                l, data = self._device.read()
+                if l > 0:
+                    self._socket_pump.write(data)
+                errors = 0
+            except alsaaudio.ALSAAudioError as e:
+                if not self._started:
+                    break # stop() raced us, not an error
+                logger.error("ALSA read error - %s", e)
+                errors += 1
+            except Exception as e:
+                if not self._started:
+                    break # stop() raced us, not an error
+                logger.error("Capture error - %s", e)
+                errors += 1
+
+            if errors:
+                if errors >= 5:
+                    # the device is gone, not hiccuping; report and bail
+                    # rather than spin (stop() must come from the ioloop
+                    # side, as it joins this thread)
+                    logger.error("Too many consecutive capture errors - "
+                        "giving up.")
+                    if self.on_fatal_error:
+                        self.ioloop.add_callback(
+                            self.on_fatal_error,
+                            "repeated capture errors")
+                    break
+                # brief pause so a transient fault is not retried in a
+                # zero-delay loop
+                sleep(0.25)
+
     def _fatal_pump_error(self, error):
         """Called when a fatal socket pump error occurs. The pump automatically
         stops.
         """
-        logger.error("Fatal socket pump error - {}".format(error))
+        logger.error("Fatal socket pump error - %s", error)
         self.stop()
         if self.on_fatal_error:
             self.on_fatal_error(error)
@@ -0,0 +1,104 @@
+# cython: language_level=3
+"""Cython-accelerated SPSC byte ring buffer. Mirrors the pure-Python
+SpscByteBuffer in pytooth.other.buffers, with the bulk copies done by
+memcpy with the GIL released so the producer and consumer threads can
+truly overlap.
+"""
+
+from cpython.bytes cimport PyBytes_AS_STRING, PyBytes_FromStringAndSize
+from libc.stdlib cimport free, malloc
+from libc.string cimport memcpy
+
+
+cdef class SpscByteBuffer:
+
+    cdef char *_buf
+    cdef size_t _size
+    cdef size_t _mask
+    cdef unsigned long long _head
+    cdef unsigned long long _tail
+
+    def __cinit__(self, capacity):
+        # round the capacity up to a power of two for fast index masking
+        cdef size_t size = 1
+        while size < <size_t>capacity:
+            size *= 2
+        self._size = size
+        self._mask = size - 1
+        self._buf = <char *>malloc(size)
+        if self._buf == NULL:
+            raise MemoryError()
+        self._head = 0
+        self._tail = 0
+
+    def __dealloc__(self):
+        if self._buf != NULL:
+            free(self._buf)
+
+    @property
+    def length(self):
+        return self._head - self._tail
+
+    def append(self, data):
+        """Copies data into the buffer, dropping the oldest bytes if there
+        is not enough free space.
+        """
+        cdef const unsigned char[::1] view = data
+        cdef size_t n = <size_t>view.shape[0]
+        cdef size_t i
+        cdef size_t first
+        if n == 0:
+            return
+        if n > self._size:
+            # only the newest capacity's worth can survive anyway
+            view = view[view.shape[0] - <Py_ssize_t>self._size:]
+            n = self._size
+        if self._head + n > self._tail + self._size:
+            self._tail = self._head + n - self._size # drop-oldest
+        i = <size_t>(self._head & self._mask)
+        first = n if n < self._size - i else self._size - i
+        with nogil:
+            memcpy(self._buf + i, &view[0], first)
+            if first < n:
+                memcpy(self._buf, &view[first], n - first)
+        self._head += n
+
+    def get(self, num_bytes):
+        """Returns up to num_bytes of the oldest buffered data as bytes.
+        """
+        cdef size_t avail = <size_t>(self._head - self._tail)
+        cdef size_t n = <size_t>num_bytes
+        cdef size_t i
+        cdef size_t first
+        cdef char *p
+        if n > avail:
+            n = avail
+        i = <size_t>(self._tail & self._mask)
+        first = n if n < self._size - i else self._size - i
+        out = PyBytes_FromStringAndSize(NULL, <Py_ssize_t>n)
+        p = PyBytes_AS_STRING(out)
+        with nogil:
+            memcpy(p, self._buf + i, first)
+            if first < n:
+                memcpy(p + first, self._buf, n - first)
+        self._tail += n
+        return out
+
+    def try_get(self, num_bytes):
+        """Returns exactly num_bytes of the oldest buffered data, or None
+        if less is available.
+        """
+        if self._head - self._tail < <unsigned long long>num_bytes:
+            return None
+        return self.get(num_bytes)
+
+    def peek(self, num_bytes):
+        """This ring's get() already copies via a GIL-released memcpy, so
+        there is no zero-copy peek path; callers fall back to try_get.
+        """
+        return None
+
+    def advance(self, num_bytes):
+        """Marks data returned by peek() as consumed.
+        """
+        self._tail += <unsigned long long>num_bytes
@@ -7,12 +7,16 @@ logger = logging.getLogger(__name__)
 
 
 class ThreadSafeMemoryBuffer:
-	"""A very simple thread-safe memory buffer that stores raw bytes.
+	"""A very simple thread-safe memory buffer that stores raw bytes. The
+	buffer is bounded: once max_bytes is reached the oldest data is
+	dropped, so a stalled consumer costs one localised glitch instead of
+	unbounded memory growth and ever-increasing latency.
 	"""
 
-	def __init__(self):
+	def __init__(self, max_bytes=64000):
 		self._buffer = b''
 		self._lock = Lock()
+		self._max_bytes = max_bytes
 
 	@property
 	def length(self):
@@ -25,10 +29,185 @@ class ThreadSafeMemoryBuffer:
 			self._buffer = self._buffer[num_bytes:]
 			return data
 
+	def try_get(self, num_bytes):
+		"""Atomically returns num_bytes of data, or None if less than
+		num_bytes is buffered. One lock acquisition instead of a separate
+		length test plus get().
+		"""
+		with self._lock:
+			if len(self._buffer) < num_bytes:
+				return None
+			data = self._buffer[0:num_bytes]
+			self._buffer = self._buffer[num_bytes:]
+			return data
+
 	def prepend(self, data):
 		with self._lock:
 			self._buffer = data + self._buffer
+			drop = len(self._buffer) - self._max_bytes
+			if drop > 0:
+				# data is being pushed back for re-reading, so here the
+				# newest (tail) bytes are the ones shed
+				logger.warning("Dropped %s bytes to bound buffer.", drop)
+				self._buffer = self._buffer[:self._max_bytes]
 
 	def append(self, data):
 		with self._lock:
 			self._buffer += data
+			drop = len(self._buffer) - self._max_bytes
+			if drop > 0:
+				logger.warning("Dropped %s bytes to bound buffer.", drop)
+				self._buffer = self._buffer[drop:]
+
+class SpscRingBuffer:
+	"""A single-producer/single-consumer ring buffer of fixed-size slots,
+	backed by one preallocated bytearray. The producer fills slots in-place
+	(e.g. via recv_into) and the consumer reads them without locking, as
+	each index is owned by exactly one thread. On overflow the oldest
+	unread slot is dropped, as befits real-time audio data.
+	"""
+
+	def __init__(self, slot_size, slot_count):
+		# round the slot count up to a power of two for fast index masking
+		count = 1
+		while count < slot_count:
+			count *= 2
+		self._mask = count - 1
+		self._slot_size = slot_size
+		self._buffer = bytearray(slot_size * count)
+		self._view = memoryview(self._buffer)
+		self._lengths = [0] * count
+		# monotonically increasing; the producer only writes _head and the
+		# consumer only writes _tail (bar the benign drop-oldest race)
+		self._head = 0
+		self._tail = 0
+
+	@property
+	def slot_size(self):
+		return self._slot_size
+
+	def __len__(self):
+		return self._head - self._tail
+
+	def write_slot(self):
+		"""Returns a memoryview of the next free slot for the producer to
+		fill. If the ring is full, the oldest unread slot is dropped.
+		"""
+		if self._head - self._tail > self._mask:
+			self._tail += 1 # drop-oldest
+		i = (self._head & self._mask) * self._slot_size
+		return self._view[i:i + self._slot_size]
+
+	def commit(self, length):
+		"""Publishes the slot returned by the last write_slot() call.
+		"""
+		self._lengths[self._head & self._mask] = length
+		self._head += 1
+
+	def read_slot(self):
+		"""Returns a memoryview of the oldest unread slot, or None if the
+		ring is empty. advance() must be called once the data is consumed.
+		"""
+		if self._head == self._tail:
+			return None
+		idx = self._tail & self._mask
+		i = idx * self._slot_size
+		return self._view[i:i + self._lengths[idx]]
+
+	def advance(self):
+		"""Marks the slot returned by read_slot() as consumed.
+		"""
+		self._tail += 1
+
+class SpscByteBuffer:
+	"""A lock-free single-producer/single-consumer byte buffer backed by
+	one fixed preallocated bytearray. The producer only writes _head and
+	the consumer only writes _tail, so no lock is needed (integer
+	assignment is atomic under the GIL) and appends/reads cost two slice
+	copies at most instead of rebuilding the whole pending buffer. On
+	overflow the oldest bytes are dropped, as befits real-time audio data.
+	"""
+
+	def __init__(self, capacity):
+		# round the capacity up to a power of two for fast index masking
+		size = 1
+		while size < capacity:
+			size *= 2
+		self._mask = size - 1
+		self._size = size
+		self._buffer = bytearray(size)
+		self._view = memoryview(self._buffer)
+		# monotonically increasing byte counters
+		self._head = 0
+		self._tail = 0
+
+	@property
+	def length(self):
+		return self._head - self._tail
+
+	def append(self, data):
+		"""Copies data into the buffer, dropping the oldest bytes if there
+		is not enough free space.
+		"""
+		n = len(data)
+		if n > self._size:
+			# only the newest capacity's worth can survive anyway
+			data = data[-self._size:]
+			n = self._size
+		overflow = (self._head + n) - (self._tail + self._size)
+		if overflow > 0:
+			self._tail += overflow # drop-oldest
+		i = self._head & self._mask
+		first = min(n, self._size - i)
+		self._view[i:i + first] = data[:first]
+		if first < n:
+			self._view[0:n - first] = data[first:]
+		self._head += n
+
+	def get(self, num_bytes):
+		"""Returns up to num_bytes of the oldest buffered data as bytes.
+		"""
+		n = min(num_bytes, self._head - self._tail)
+		i = self._tail & self._mask
+		first = min(n, self._size - i)
+		if first < n:
+			data = bytes(self._view[i:i + first]) + \
+				bytes(self._view[0:n - first])
+		else:
+			data = bytes(self._view[i:i + first])
+		self._tail += n
+		return data
+
+	def try_get(self, num_bytes):
+		"""Returns exactly num_bytes of the oldest buffered data, or None
+		if less is available. One consumer-side availability check fused
+		with the read, instead of a separate length test plus get().
+		"""
+		if self._head - self._tail < num_bytes:
+			return None
+		return self.get(num_bytes)
+
+	def peek(self, num_bytes):
+		"""Returns a zero-copy memoryview of the oldest num_bytes, without
+		consuming them - call advance() once the data has been used. Returns
+		None if less is available or the span wraps the ring edge (callers
+		fall back to try_get for that rare case).
+		"""
+		if self._head - self._tail < num_bytes:
+			return None
+		i = self._tail & self._mask
+		if self._size - i < num_bytes:
+			return None
+		return self._view[i:i + num_bytes]
+
+	def advance(self, num_bytes):
+		"""Marks data returned by peek() as consumed.
+		"""
+		self._tail += num_bytes
+
+# prefer the Cython ring (it releases the GIL around its copies) when the
+# extension was built; the pure-Python class above is the fallback
+try:
+	from pytooth.other._ring import SpscByteBuffer # noqa: F811
+except ImportError:
+	pass
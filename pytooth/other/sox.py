@@ -2,12 +2,10 @@
 """
 
 import logging
+import socket
 
-from tornado.iostream import IOStream
 from tornado.process import Subprocess
 
-from pytooth.errors import InvalidOperationError
-
 logger = logging.getLogger(__name__)
 
 
@@ -34,7 +32,7 @@ class SoxDecoder:
     @property
     def codec(self):
         return self._codec
-    
+
     @property
     def channels(self):
         return self._channels
@@ -45,11 +43,11 @@ class SoxDecoder:
             1: "Mono",
             2: "Stereo"
         }.get(self._channels, "Unknown")
-    
+
     @property
     def sample_rate(self):
         return self._sample_rate
-    
+
     @property
     def sample_size(self):
         return self._sample_size
@@ -60,7 +58,18 @@ class SoxDecoder:
         if self._started:
             return
 
-        # process
+        # did we get socket or fd?
+        sock = socket_or_fd
+        if isinstance(socket_or_fd, int):
+            logger.debug("SoxDecoder received fd, building socket...")
+            sock = socket.socket(fileno=socket_or_fd)
+        sock.setblocking(True)
+        # keep a reference so the fd stays open for the child's lifetime
+        self._sock = sock
+
+        # process; the transport fd is handed to sox as its stdin, so the
+        # child reads the compressed stream straight off the socket - no
+        # Python-level relay and no extra pipe on the input side at all
         self._process = Subprocess(
             [
                 "sox",
@@ -77,7 +86,7 @@ class SoxDecoder:
                 "wav",
                 "-"
             ],
-            stdin=Subprocess.STREAM,
+            stdin=sock.fileno(),
             stdout=Subprocess.STREAM,
             stderr=Subprocess.STREAM)
         self._process.stdout.set_close_callback(self._on_close)
@@ -86,17 +95,6 @@ class SoxDecoder:
         self._process.stderr.read_until_close(
             streaming_callback=self._sox_error)
 
-        # did we get socket or fd?
-        sock = socket_or_fd
-        if isinstance(socket_or_fd, int):
-            logger.debug("SoxDecoder received fd, building socket...")
-            sock = socket.socket(fileno=socket_or_fd)
-        sock.setblocking(True)
-
-        # input pump
-        self._input = IOStream(socket=sock)
-        self._input.read_until_close(self._in_data_ready)
-
         # start
         self._started = True
 
@@ -113,6 +111,7 @@ class SoxDecoder:
         self._started = False
         self._process.proc.kill()
         self._process = None
+        self._sock = None
 
     def _on_close(self, *args):
         """Called when the Sox process exits.
@@ -125,14 +124,6 @@ class SoxDecoder:
         if self.on_close:
             self.on_close()
 
-    def _in_data_ready(self, data):
-        """Writes encoded data to the Sox input stream.
-        """
-        if not self._started:
-            raise InvalidOperationError("Not started.")
-
-        self._process.stdin.write(data)
-
     def _out_data_ready(self, data):
         """Called when decoded data is ready.
         """
@@ -2,9 +2,12 @@
 """
 
 import logging
+import weakref
+from collections import deque
+from time import monotonic
 
 from dbus import UInt16
-from tornado.ioloop import IOLoop
+from tornado.ioloop import IOLoop, PeriodicCallback
 
 from pytooth.bluez5.dbus import ObexSessionFactory, PhonebookClient, Profile
 from pytooth.bluez5.helpers import Bluez5Utils
@@ -14,6 +17,16 @@ from pytooth.pbap.constants import PBAP_PROFILE_UUID, \
 
 logger = logging.getLogger(__name__)
 
+# registration options never vary, so build them (and box the UInt16)
+# once rather than per _register call
+_PROFILE_OPTS = {
+    "Name": "Phonebook Access Profile",
+    "Version": UInt16(0x0102),
+    "Features": 0,
+    "RequireAuthentication": True,
+    "RequireAuthorization": False,
+}
+
 
 class ProfileManager:
     """Manages profile object interactions with bluez5. Can handle multiple
@@ -28,7 +41,7 @@ class ProfileManager:
         self._started = False
         self._system_bus = system_bus
 
-        self.io_loop = IOLoop.instance()
+        self.io_loop = IOLoop.current()
 
         # events
         self.on_connected_changed = None
@@ -70,13 +83,7 @@ class ProfileManager:
         self._profilemgr_proxy.proxy.RegisterProfile(
             PBAP_DBUS_PROFILE_ENDPOINT,
             PBAP_PROFILE_UUID,
-            {
-                "Name": "Phonebook Access Profile",
-                "Version": UInt16(0x0102),
-                "Features": 0,
-                "RequireAuthentication": True,
-                "RequireAuthorization": False,
-            })
+            _PROFILE_OPTS)
         logger.debug("Registered PBAP profile on DBus.")
 
     def _unregister(self):
@@ -126,12 +133,21 @@ class ClientManager:
     allow one client per session/client pair per remote PBAP server.
     """
 
+    # parked clients kept per destination, and how long one may sit
+    # idle before the reaper closes it
+    _POOL_SIZE = 2
+    _IDLE_LIFETIME = 300
+
     def __init__(self, session_bus):
         # key: destination address
         # value: PhonebookClient instance
         self._clients = None
         self._factory = ObexSessionFactory(
             session_bus=session_bus)
+        # key: destination address
+        # value: deque of (client, parked timestamp) tuples
+        self._idle_clients = None
+        self._reaper = None
         self._started = False
         self._session_bus = session_bus
 
@@ -141,7 +157,22 @@ class ClientManager:
         if self._started:
             return
 
-        self._clients = {}
+        # weak values: a caller who drops every reference to a client
+        # without disconnecting no longer pins its session alive; the
+        # finalizer registered in connect() tears the session down when
+        # the client is collected
+        self._clients = weakref.WeakValueDictionary()
+        self._finalizers = {} # id(client): finalizer
+        # session setup (DBus round-trip plus RFCOMM connect) dominates
+        # PBAP fetch latency, so disconnected clients are parked here with
+        # their sessions intact instead of being torn down; destinations
+        # are not known until devices appear, so the pool warms on first
+        # use
+        self._idle_clients = {}
+        self._reaper = PeriodicCallback(
+            callback=self._reap_idle_clients,
+            callback_time=60000)
+        self._reaper.start()
         self._started = True
 
     def stop(self):
@@ -150,15 +181,32 @@ class ClientManager:
         if not self._started:
             return
 
-        # close any open sessions
-        logger.debug("Disconnecting {} forgotten Obex session(s)...".format(
-            len(self._clients)))
-        for dest, _ in dict(self._clients).items():
+        self._reaper.stop()
+        self._reaper = None
+
+        # close any open sessions; popitem-draining avoids snapshotting
+        # the dict just to iterate it, and going straight to the factory
+        # skips disconnect()'s parking of sessions we are about to destroy
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Disconnecting %s forgotten Obex session(s)...",
+                len(self._clients))
+        while self._clients:
+            dest, client = self._clients.popitem()
             try:
-                self.disconnect(destination=dest)
-            except ConnectionError:
-                pass
+                client.abort()
+                self._destroy_client_session(client)
+            except Exception:
+                logger.exception("Error disconnecting Obex session to "
+                    "'%s'.", dest)
+        for pool in self._idle_clients.values():
+            for client, _ in pool:
+                try:
+                    self._destroy_client_session(client)
+                except Exception:
+                    logger.exception("Error destroying idle Obex session.")
         self._clients = None
+        self._finalizers = None
+        self._idle_clients = None
         self._started = False
 
     def connect(self, destination):
@@ -173,24 +221,43 @@ class ClientManager:
         if destination in self._clients:
             return self._clients[destination]
 
+        # a parked client skips the session setup cost entirely, and
+        # re-uses its already-resolved DBus proxy and signal receiver
+        pool = self._idle_clients.get(destination)
+        if pool:
+            client, _ = pool.popleft()
+            self._clients[destination] = client
+            logger.debug("Reusing parked Obex session to '%s'.",
+                destination)
+            return client
+
         session = self._factory.create_session(
             destination=destination,
             target="pbap")
         try:
-            self._clients[destination] = PhonebookClient(
+            client = PhonebookClient(
                 session_bus=self._session_bus,
                 session=session)
-            logger.debug("Obex session to '{}' has been established.".format(
-                destination))
-            return self._clients[destination]
+            self._clients[destination] = client
+            # if the client is garbage-collected without a disconnect(),
+            # its session still gets torn down rather than leaking the
+            # DBus object and RFCOMM fd
+            self._finalizers[id(client)] = weakref.finalize(
+                client,
+                self._client_collected,
+                key=id(client),
+                session=session)
+            logger.debug("Obex session to '%s' has been established.",
+                destination)
+            return client
         except Exception:
-            logger.exception("Error creating Obex session to '{}'.".format(
-                destination))
+            logger.exception("Error creating Obex session to '%s'.",
+                destination)
             try:
                 self._factory.destroy_session(session=session)
             except Exception:
-                logger.exception("Error disconnecting Obex session to '{}'."
-                    "".format(destination))
+                logger.exception("Error disconnecting Obex session to "
+                    "'%s'.", destination)
             raise ConnectionError("Error connecting to '{}'.".format(
                 destination))
 
@@ -207,18 +274,64 @@ class ClientManager:
 
         try:
             self._clients[destination].abort()
-            self._factory.destroy_session(
-                session=self._clients[destination].session)
-            logger.debug("Obex session to '{}' has been disconnected.".format(
-                destination))
+            # park the whole client for reuse unless the pool is full;
+            # tearing it down only to rebuild it would redo DBus proxy
+            # resolution and stack another signal receiver on the bus
+            pool = self._idle_clients.setdefault(destination, deque())
+            if len(pool) < ClientManager._POOL_SIZE:
+                pool.append(
+                    (self._clients[destination], monotonic()))
+            else:
+                self._destroy_client_session(self._clients[destination])
+            logger.debug("Obex session to '%s' has been disconnected.",
+                destination)
         except Exception:
-            logger.exception("Error disconnecting Obex session to '{}'.".format(
-                destination))
+            logger.exception("Error disconnecting Obex session to '%s'.",
+                destination)
             raise ConnectionError("Error disconnecting from '{}'.".format(
                 destination))
         finally:
             self._clients.pop(destination)
 
+    def _reap_idle_clients(self):
+        """Destroys the sessions of parked clients that have sat idle beyond
+        the lifetime cap, as the remote end has most likely dropped them by
+        then.
+        """
+        cutoff = monotonic() - ClientManager._IDLE_LIFETIME
+        for dest, pool in self._idle_clients.items():
+            while pool and pool[0][1] < cutoff:
+                client, _ = pool.popleft()
+                try:
+                    self._destroy_client_session(client)
+                    logger.debug("Reaped idle Obex session to '%s'.",
+                        dest)
+                except Exception:
+                    logger.exception("Error reaping idle Obex session to "
+                        "'%s'.", dest)
+
+    def _client_collected(self, key, session):
+        """GC finalizer for a client that was dropped without a
+        disconnect(); tears its session down so the DBus object and RFCOMM
+        fd do not leak.
+        """
+        if self._finalizers is not None:
+            self._finalizers.pop(key, None)
+        try:
+            self._factory.destroy_session(session=session)
+        except Exception:
+            logger.exception("Error destroying session of collected "
+                "client.")
+
+    def _destroy_client_session(self, client):
+        """Destroys a client's session, detaching its GC finalizer first so
+        the session cannot be destroyed a second time on collection.
+        """
+        finalizer = self._finalizers.pop(id(client), None)
+        if finalizer is not None:
+            finalizer.detach()
+        self._factory.destroy_session(session=client.session)
+
     def get_client(self, destination):
         """Returns the client, if any, associated with the connection to
         device specified by `destination`. This returns None if no connection
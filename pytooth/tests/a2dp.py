@@ -20,6 +20,12 @@ class TestApplication:
 
     def __init__(self, session_bus, system_bus, config):
         self.sink = None
+        self._sink_transport = None
+
+        # one decoder for the life of the application; building it per
+        # stream would dlopen libsbc again on every track start
+        self._decoder = SBCDecoder(
+            libsbc_so_file="/usr/local/lib/libsbc.so.1.2.0")
 
         # profile setup
         a2dp = AdvancedAudioProfile(
@@ -43,68 +49,72 @@ class TestApplication:
     def stop(self):
         # cleanup
         if self.a2dp.adapter_connected:
-            self.a2dp.set_discoverable(enabled=False)
-            self.a2dp.set_pairable(enabled=False)
+            self.a2dp.set_visibility(discoverable=False, pairable=False)
         self.a2dp.stop()
         self._stop_audio()
 
     def _adapter_connected_changed(self, adapter, connected):
-        logger.debug("Adapter {} is now {}.".format(
-            adapter, "connected" if connected else "disconnected"))
+        logger.debug("Adapter %s is now %s.",
+            adapter, "connected" if connected else "disconnected")
 
         # be discoverable and pairable if adapter is connected
         # note: it is an error to call this if no adapter is avilable
         if connected:
-            self.a2dp.set_discoverable(enabled=True)
-            self.a2dp.set_pairable(enabled=True)
+            self.a2dp.set_visibility(discoverable=True, pairable=True)
 
     def _audio_setup_error(self, adapter, error):
         """Fired if an audio link could not be established. This higher-level
         class doesn't have to do anything to cleanup the connection(s) or audio
         paths.
         """
-        logger.error("Cannot establish audio link on adapter {} - {}".format(
-            adapter, error))
+        logger.error("Cannot establish audio link on adapter %s - %s",
+            adapter, error)
 
     def _audio_stream_state_changed(self, adapter, transport, state):
         """Fired when the audio stream state changes. There is no explicit
         connected/disconnected as it is more suitable to simply react off the
         status rather than a binary flag.
         """
-        if state == "playing" and self.sink is None:
-            self._start_audio(transport=transport)
+        if state == "playing":
+            # a repeated "playing" on the transport we are already serving
+            # (pause/resume, status chatter) is a no-op; only a genuinely
+            # new transport forces a sink teardown/rebuild
+            if self.sink and self._sink_transport is not transport:
+                self._stop_audio()
+            if self.sink is None:
+                self._start_audio(transport=transport)
         elif state == "released" and self.sink:
             self._stop_audio()
 
     def _audio_track_changed(self, track):
-        logger.info("Track changed - {}".format(track))
+        logger.info("Track changed - %s", track)
         
     def _device_connected_changed(self, device, connected):
         """Fired when a device connects but has not completed initial handshake
         with the protocol.
         """
-        logger.info("Device {} has {}connected.".format(
-            device, "" if connected else "not "))
+        logger.info("Device %s has %sconnected.",
+            device, "" if connected else "not ")
 
     def _profile_status_changed(self, available):
         """Fired when the profile is enabled/disabled at the Bluez5 level. This
         really only occurs if a serious issue with the Bluetooth stack is
         encountered by the OS.
         """
-        logger.info("A2DP profile is {}avaiable.".format(
-            "" if avaiable else "not "))
+        logger.info("A2DP profile is %savailable.",
+            "" if available else "not ")
 
     def _start_audio(self, transport=None):
         # streaming has started, obviously
 
         self.sink = AlsaAudioSink(
-            decoder=SBCDecoder(
-                libsbc_so_file="/usr/local/lib/libsbc.so.1.2.0"),
+            decoder=self._decoder,
             socket=transport.socket,
             read_mtu=transport.read_mtu,
             device_name="default")
         self.sink.start()
-        logger.info("Built new AlsaAudioSink with SBCDecoder.")
+        self._sink_transport = transport
+        logger.info("Built new AlsaAudioSink with shared SBCDecoder.")
 
     def _stop_audio(self):
         # no more streaming, obviously
@@ -112,4 +122,5 @@ class TestApplication:
         if self.sink:
             self.sink.stop()
             self.sink = None
+            self._sink_transport = None
             logger.info("Destroyed AlsaAudioSink.")
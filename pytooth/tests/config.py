@@ -1,23 +1,69 @@
 """Provides helper methods for handling configuration definition and validation.
 """
 
+import copy
 import json
+import os
 
 from pytooth.tests.errors import ConfigurationError
 
+# prefer orjson's C-level parser when it is installed; the stdlib module
+# is the fallback
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# parsed configs keyed by (filename, mtime, size), so repeated in-process
+# invocations (supervisors, test harnesses) skip the disk read and parse
+_cache = {}
 
 def get_config(filename):
     """Reads in the specified JSON-formatted file and returns it as a dictionary
-    using the ``json`` module. Throws ``dishtube.errors.ConfigurationError``
-    if an error occurred.
+    using the ``orjson`` module if available, else the ``json`` module. Throws
+    ``dishtube.errors.ConfigurationError`` if an error occurred.
     """
 
     try:
-        with open(filename, 'r') as f:
-            return json.load(f)
+        st = os.stat(filename)
+        key = (filename, st.st_mtime_ns, st.st_size)
+        cached = _cache.get(key)
+        if cached is None:
+            # read as bytes: orjson parses them directly, and the stdlib
+            # accepts them too, skipping the text-mode decode layer
+            with open(filename, 'rb') as f:
+                data = f.read()
+            if orjson is not None:
+                cached = orjson.loads(data)
+            else:
+                cached = json.loads(data)
+            _cache.clear() # old versions of the file are dead weight
+            _cache[key] = cached
+        # deep-copied so callers can mutate their config freely without
+        # poisoning the cache
+        return copy.deepcopy(cached)
     except Exception as e:
         raise ConfigurationError(e)
 
+# one (key, default, required type(s), predicate, error message) entry
+# per field; a single pass over this table replaces the per-field check
+# blocks and the exception-driven range test
+_SCHEMA = (
+    # A JSON-formatted file containing logging configuration.
+    ("logging", {}, dict, None,
+        "'logging' must be dictionary."),
+    # Interval in seconds to wait between adapter checks
+    ("retryinterval", 0, (int, float), lambda v: v >= 5,
+        "'retryinterval' must be at least 5."),
+    # List of profiles
+    ("profiles", [], list, lambda v: len(v) > 0,
+        "'profiles' must be a non-empty list."),
+    # Optional string properties
+    ("preferredaddress", None, str, None,
+        "'preferredaddress' must be a string."),
+)
+
 def validate_config(config):
     """Validates the supplied configuration. Validation does not include checks
     for valid values parses the data against a defined configuration and
@@ -28,29 +74,7 @@ def validate_config(config):
     if not isinstance(config, dict):
         raise TypeError("config must be a dictionary.")
 
-    # A JSON-formatted file containing logging configuration.
-    arg = config.get("logging", {})
-    if not isinstance(arg, dict):
-        raise ConfigurationError("'logging' must be dictionary.")
-
-    # Interval in seconds to wait between adapter checks
-    arg = config.get("retryinterval", 0)
-    try:
-        if arg < 5:
-            raise ValueError()
-    except Exception:
-        raise ConfigurationError("'retryinterval' must be at least 5.")
-    
-    # List of profiles
-    arg = config.get("profiles", [])
-    if not isinstance(arg, list):
-        raise ConfigurationError("'profiles' must be a non-empty list.")
-    if len(arg) == 0:
-        raise ConfigurationError("'profiles' must be a non-empty list.")
-
-    # Optional string properties
-    for s in ["preferredaddress"]:
-        arg = config.get(s, None)
-        if not isinstance(arg, str):
-            raise ConfigurationError(
-                "'{}' must be a string.".format(s))
+    for key, default, typ, pred, msg in _SCHEMA:
+        arg = config.get(key, default)
+        if not isinstance(arg, typ) or (pred and not pred(arg)):
+            raise ConfigurationError(msg)
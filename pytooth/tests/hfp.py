@@ -21,11 +21,18 @@ class TestApplication:
     def __init__(self, session_bus, system_bus, config):
         # setup
         self.phone = None
-        self._sink = None
-        self._source = None
         self._socket_pump = RealTimeSocketPump()
+        self._socket_pump.cpu_affinity = config.get("scoreadercpu")
         self._oncall = False
 
+        # build the sink/source once and start/stop them per call, rather
+        # than constructing fresh objects (and rebinding pump callbacks)
+        # on every call setup
+        self._sink = AlsaAudioSink(
+            socket_pump=self._socket_pump,
+            device_name="default")
+        self._source = None
+
         # profile setup
         hfp = HandsFreeProfile(
             system_bus=system_bus,
@@ -47,20 +54,18 @@ class TestApplication:
     def stop(self):
         # cleanup
         if self.hfp.adapter_connected:
-            self.hfp.set_discoverable(enabled=False)
-            self.hfp.set_pairable(enabled=False)
+            self.hfp.set_visibility(discoverable=False, pairable=False)
         self.hfp.stop()
         self._stop_audio()
 
     def _adapter_connected_changed(self, adapter, connected):
-        logger.debug("Adapter {} is now {}.".format(
-            adapter, "connected" if connected else "disconnected"))
+        logger.debug("Adapter %s is now %s.",
+            adapter, "connected" if connected else "disconnected")
 
         # be discoverable and pairable if adapter is connected
         # note: it is an error to call this if no adapter is avilable
         if connected:
-            self.hfp.set_discoverable(enabled=True)
-            self.hfp.set_pairable(enabled=True)
+            self.hfp.set_visibility(discoverable=True, pairable=True)
 
     def _audio_connected_changed(self, adapter, connected, socket, mtu, peer):
         """Fired when the remote device establishes an audio connection with
@@ -80,20 +85,20 @@ class TestApplication:
         class doesn't have to do anything to cleanup the connection(s) or audio
         paths.
         """
-        logger.error("Cannot establish audio link on adapter {} - {}".format(
-            adapter, error))
+        logger.error("Cannot establish audio link on adapter %s - %s",
+            adapter, error)
 
     def _device_connected_changed(self, device, connected, phone):
         """Fired when a device connects but has not completed initial handshake
         with the protocol.
         """
-        logger.info("Device {} has {}connected.".format(
-            device, "" if connected else "not "))
+        logger.info("Device %s has %sconnected.",
+            device, "" if connected else "not ")
 
         # keep phone proxy reference if connected
         self.phone = None
         if connected:
-            logger.debug("Peer MAC address = {}".format(phone.peer))
+            logger.debug("Peer MAC address = %s", phone.peer)
             self.phone = phone
             phone.on_connected_changed = self._phone_connected_changed
             phone.on_event = self._phone_event
@@ -103,46 +108,47 @@ class TestApplication:
         really only occurs if a serious issue with the Bluetooth stack is
         encountered by the OS.
         """
-        logger.info("HFP profile is {}avaiable.".format(
-            "" if avaiable else "not "))
+        logger.info("HFP profile is %savailable.",
+            "" if available else "not ")
 
     def _phone_connected_changed(self, connected):
         """Fired when a connected device has completed initial handshake. The
         properties of 'phone' below are only available after handshake.
         """
-        logger.info("Phone remote control connection is {}.".format(
-            "established" if connected else "released"))
+        logger.info("Phone remote control connection is %s.",
+            "established" if connected else "released")
 
         if connected:
-            logger.info("Phone properties: Codec={}, Features={}, Multi-call={}"
-                "".format(
-                    self.phone.codec,
-                    self.phone.features,
-                    self.phone.multicall))
+            logger.info("Phone properties: Codec=%s, Features=%s, "
+                "Multi-call=%s",
+                self.phone.codec,
+                self.phone.features,
+                self.phone.multicall)
 
     def _phone_event(self, name, **kwargs):
         """An (a)synchronous phone event occurred.
         """
-        logger.info("Received phone event: name=\"{}\", kwargs={}".format(
-            name, kwargs))
+        logger.info("Received phone event: name=\"%s\", kwargs=%s",
+            name, kwargs)
 
     def _start_audio(self, socket, mtu):
         # audio can start via 2 use cases:
         # - phone makes call
         # - phone receives call
 
-        self._sink = AlsaAudioSink(
-            socket_pump=self._socket_pump,
-            device_name="default")
         self._sink.start()
-        logger.info("Built new AlsaAudioSink.")
-
-        self._source = AlsaAudioSource(
-            socket_pump=self._socket_pump,
-            mtu=mtu,
-            device_name="default")
+        logger.info("Started the AlsaAudioSink.")
+
+        # the source depends on the negotiated MTU, so it can only be
+        # built once the first audio link is up
+        if self._source is None or self._source.mtu != mtu:
+            self._source = AlsaAudioSource(
+                socket_pump=self._socket_pump,
+                mtu=mtu,
+                device_name="default")
+            logger.info("Built new AlsaAudioSource.")
         self._source.start()
-        logger.info("Built new AlsaAudioSource.")
+        logger.info("Started the AlsaAudioSource.")
 
         self._socket_pump.start(
             socket=socket,
@@ -156,13 +162,11 @@ class TestApplication:
 
         if self._sink:
             self._sink.stop()
-            self._sink = None
-            logger.info("Destroyed AlsaAudioSink.")
+            logger.info("Stopped the AlsaAudioSink.")
 
         if self._source:
             self._source.stop()
-            self._source = None
-            logger.info("Destroyed AlsaAudioSource.")
+            logger.info("Stopped the AlsaAudioSource.")
 
         if self._socket_pump.started:
             self._socket_pump.stop()
@@ -1,53 +1,74 @@
 """Defines a test entry point."""
 
-import argparse
-from functools import partial
+from functools import lru_cache, partial
+import hashlib
+import importlib
+import json
 import logging
 import logging.config
 import signal
 import sys
 
-from tornado.ioloop import IOLoop, PeriodicCallback
+from tornado.ioloop import IOLoop
 
-from pytooth.gi.loops import GtkMainLoop
 import pytooth.tests.config
 from pytooth.tests.errors import ConfigurationError
 
 
-_closing = False
+def try_exit(gtkloop, apps):
+    for app in apps:
+        try:
+            app.stop()
+        except Exception:
+            logging.exception("Error gracefully stopping application '%s'.",
+                app)
+    gtkloop.stop()
+    logging.info("Gracefully stopped. Have a nice day.")
 
-def signal_handler(signum, frame):
-    global _closing
-    _closing = True
+# fingerprint of the last-applied logging configuration
+_logging_fingerprint = None
 
-def try_exit(gtkloop, apps):
-    global _closing
+def _apply_logging_config(logging_config):
+    """Applies the supplied logging configuration via dictConfig, unless it
+    is byte-identical to the one already in effect - dictConfig tears down
+    and rebuilds every handler, which is wasteful for a no-op change.
+    """
+    global _logging_fingerprint
 
-    if _closing:
-        for app in apps:
-            try:
-                app.stop()
-            except Exception:
-                logging.exception("Error gracefully stopping application '{}'.".format(
-                    app))
-        gtkloop.stop()
-        logging.info("Gracefully stopped. Have a nice day.")
+    fingerprint = hashlib.blake2b(
+        json.dumps(logging_config, sort_keys=True).encode()).digest()
+    if fingerprint == _logging_fingerprint:
+        return
+
+    logging.config.dictConfig(logging_config)
+    _logging_fingerprint = fingerprint
+
+@lru_cache(maxsize=None)
+def _profile_class(profile):
+    """Returns the test application class for the named profile. Cached so
+    a profile listed more than once is only imported once.
+    """
+    module = importlib.import_module("pytooth.tests.{}".format(profile))
+    return module.TestApplication
 
 def main():
     args = sys.argv
 
-    # process (CLI) args
-    parser = argparse.ArgumentParser(
-        prog="pytooth-test" if len(args) == 0 else args[0],
-        description="Test app launcher for the pytooth library.")
-    parser.add_argument(
-        "--config", "-c",
-        type=str,
-        required=True)
-    v = vars(parser.parse_args(args[1:]))
+    # process (CLI) args - the interface is a single required flag, so it
+    # is parsed by hand rather than paying argparse's import and parser
+    # construction cost on every launch
+    config_file = None
+    if len(args) >= 3 and args[1] in ("-c", "--config"):
+        config_file = args[2]
+    elif len(args) >= 2 and args[1].startswith("--config="):
+        config_file = args[1][len("--config="):]
+    if not config_file:
+        print("usage: {} --config <file>".format(
+            args[0] if args else "pytooth-test"))
+        sys.exit(2)
 
     # process configuration file
-    config = pytooth.tests.config.get_config(filename=v["config"])
+    config = pytooth.tests.config.get_config(filename=config_file)
     try:
         pytooth.tests.config.validate_config(config=config)
     except ConfigurationError as e:
@@ -57,13 +78,16 @@ def main():
     # apply logging configuration
     if "logging" in config:
         try:
-            logging.config.dictConfig(config["logging"])
+            _apply_logging_config(config["logging"])
             logging.info("Applied logging configuration.")
         except Exception as e:
             print("WARNING! Could not parse logging configuration, logging may "
                 "not be configured properly - {}".format(e))
 
     # make loop before connecting to DBus
+    # note: imported here so the GI/GLib stack is only loaded once the
+    # configuration is known to be usable; bad-config exits stay fast
+    from pytooth.gi.loops import GtkMainLoop
     gtkloop = GtkMainLoop(io_loop=IOLoop.instance())
     
     # create common objects
@@ -72,31 +96,35 @@ def main():
     # load profile test apps
     apps = []
     for profile in config["profiles"]:
+        # import and construction are guarded separately, so a failed
+        # constructor is not misreported as an import problem
+        try:
+            klass = _profile_class(profile)
+        except Exception:
+            logging.exception("Possible import error of '%s' profile.",
+                profile)
+            continue
         try:
-            _t = __import__(
-                "pytooth.tests.{}".format(profile),
-                globals(),
-                locals(),
-                ["TestApplication"],
-                0)
-            apps.append(_t.TestApplication(
+            apps.append(klass(
                 session_bus=session_bus,
                 system_bus=system_bus,
                 config=config))
         except Exception:
-            logging.exception("Possible import error of '{}' profile.".format(
-                profile))
+            logging.exception("Error building '%s' test application.",
+                profile)
     if len(apps) == 0:
         logging.error("No valid profiles loaded - exiting.")
         return
         
     # run the test apps
     logging.info("Running...")
-    signal.signal(signal.SIGINT, signal_handler)
-    PeriodicCallback(partial(
-        try_exit,
-        gtkloop=gtkloop,
-        apps=apps), 500).start()
+    # asyncio delivers these through its selector wakeup, so try_exit
+    # runs as an ordinary callback on the loop thread - no signal-handler
+    # frame and no dedicated waiter thread
+    aio_loop = IOLoop.instance().asyncio_loop
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        aio_loop.add_signal_handler(
+            signum, partial(try_exit, gtkloop, apps))
     for app in apps:
         app.start()
     gtkloop.start()
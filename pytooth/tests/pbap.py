@@ -1,6 +1,7 @@
 """Defines a test application for PBAP."""
 
 import logging
+import random
 
 from tornado.ioloop import IOLoop
 
@@ -17,7 +18,20 @@ class TestApplication:
     `connect` method would most likely be substituted with a user action.
     """
 
+    # slotted: the app instance is long-lived and its attribute set is
+    # fixed, so skip the per-instance dict
+    __slots__ = ("_io_loop", "_retry_delay", "pbap")
+
+    # connect retry backoff bounds, in seconds
+    _RETRY_DELAY = 5
+    _RETRY_DELAY_MAX = 60
+
     def __init__(self, session_bus, system_bus, config):
+        # cache the loop once; every timer below reuses it instead of
+        # re-resolving IOLoop.current() on each call
+        self._io_loop = IOLoop.current()
+        self._retry_delay = self._RETRY_DELAY
+
         # profile setup
         pbap = PhoneBookAccessProfile(
             session_bus=session_bus,
@@ -25,7 +39,7 @@ class TestApplication:
             adapter_class=OpenPairableAdapter,
             preferred_address=config["preferredaddress"],
             retry_interval=config["retryinterval"],
-            io_loop=IOLoop.current())
+            io_loop=self._io_loop)
         pbap.on_adapter_connected_changed = self._adapter_connected_changed
         pbap.on_device_connected_changed = self._device_connected_changed
         pbap.on_profile_status_changed = self._profile_status_changed
@@ -38,15 +52,14 @@ class TestApplication:
         self.pbap.start()
 
         # this would probably be replaced with a user action
-        IOLoop.current().call_later(
-            delay=5,
+        self._io_loop.call_later(
+            delay=self._RETRY_DELAY,
             callback=self._connect_and_transfer)
 
     def stop(self):
         # cleanup
         if self.pbap.adapter_connected:
-            self.pbap.set_discoverable(enabled=False)
-            self.pbap.set_pairable(enabled=False)
+            self.pbap.set_visibility(discoverable=False, pairable=False)
         self.pbap.stop()
 
     def _connect_and_transfer(self):
@@ -57,11 +70,18 @@ class TestApplication:
                 destination="ac:37:43:79:11:29")
         except Exception:
             logger.exception("Death during connect.")
-            IOLoop.current().call_later(
-                delay=5,
+            # back off exponentially so a phone that is simply out of range
+            # is not hammered at a fixed cadence forever; the jitter keeps
+            # several instances from retrying in lock-step
+            self._io_loop.call_later(
+                delay=self._retry_delay * random.uniform(0.5, 1.5),
                 callback=self._connect_and_transfer)
+            self._retry_delay = min(
+                self._retry_delay * 2, self._RETRY_DELAY_MAX)
             return
 
+        self._retry_delay = self._RETRY_DELAY
+
         logger.debug("Selecting phonebook...")
         client.select("int", "pb")
         logger.debug("Selected phonebook.")
@@ -69,41 +89,40 @@ class TestApplication:
         client.get_all()
 
     def _adapter_connected_changed(self, adapter, connected):
-        logger.debug("Adapter {} is now {}.".format(
-            adapter, "connected" if connected else "disconnected"))
+        logger.debug("Adapter %s is now %s.",
+            adapter, "connected" if connected else "disconnected")
 
         # be discoverable and pairable if adapter is connected
         # note: it is an error to call this if no adapter is avilable
         if connected:
-            self.pbap.set_discoverable(enabled=True)
-            self.pbap.set_pairable(enabled=True)
+            self.pbap.set_visibility(discoverable=True, pairable=True)
 
     def _device_connected_changed(self, device, connected):
         """Fired when a device connects but has not completed initial handshake
         with the protocol.
         """
-        logger.info("Device {} has {}connected.".format(
-            device, "" if connected else "not "))
+        logger.info("Device %s has %sconnected.",
+            device, "" if connected else "not ")
 
     def _profile_status_changed(self, available):
         """Fired when the profile is enabled/disabled at the Bluez5 level. This
         really only occurs if a serious issue with the Bluetooth stack is
         encountered by the OS.
         """
-        logger.info("PBAP profile is {}avaiable.".format(
-            "" if avaiable else "not "))
+        logger.info("PBAP profile is %savailable.",
+            "" if available else "not ")
 
     def _client_transfer_complete(self, client, data):
         """Fired when a transfer has completed successfully.
         """
-        logger.debug("Transfer from '{}' has completed - # bytes={}".format(
-            client.destination, len(data)))
+        logger.debug("Transfer from '%s' has completed - # bytes=%d",
+            client.destination, len(data))
         self.pbap.disconnect(destination=client.destination)
 
     def _client_transfer_error(self, client):
         """Fired when a transfer fails due to an error. Bluez5 does not provide
         error details.
         """
-        logger.debug("Transfer from '{}' encountered an error.".format(
-            client.destination))
+        logger.debug("Transfer from '%s' encountered an error.",
+            client.destination)
         self.pbap.disconnect(destination=client.destination)
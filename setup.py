@@ -1,30 +1,58 @@
 """Setup entry point."""
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+import fcntl
+import hashlib
 import os
 import platform
+import shutil
+import subprocess
+import sys
+import sysconfig
+import tarfile
 
-from setuptools import setup, find_packages
+from setuptools import Command, setup, find_packages
 
 
-# to get the long description
-with open('README.md') as f:
-    long_description = f.read()
+# resolved once; every other path hangs off this, and relative opens
+# keep working regardless of the caller's working directory
+HERE = os.path.dirname(os.path.realpath(__file__))
+
+# the long description only ships in built distributions, so plain
+# metadata probes (egg_info, --version, ...) skip the README read
+long_description = ""
+if any(cmd in sys.argv for cmd in (
+    "sdist", "bdist_wheel", "bdist_egg", "upload", "register")):
+    with open(os.path.join(HERE, 'README.md')) as f:
+        long_description = f.read()
+
+def _reqs(path):
+    """Parses a requirements-style file, skipping blank lines and
+    comments (split("\\n") left setuptools a trailing empty spec).
+    """
+    with open(path) as f:
+        return [line.strip() for line in f.read().splitlines()
+            if line.strip() and not line.lstrip().startswith("#")]
 
 # parse the reqs/deps files
-with open('requirements.txt') as f:
-    install_requirements = f.read().split("\n")
-with open('requirements_dev.txt') as f:
-    test_requirements = f.read().split("\n")
-with open('dependencies.txt') as f:
-    dependency_requirements = f.read().split("\n")
+install_requirements = _reqs(os.path.join(HERE, 'requirements.txt'))
+test_requirements = _reqs(os.path.join(HERE, 'requirements_dev.txt'))
+dependency_requirements = _reqs(os.path.join(HERE, 'dependencies.txt'))
 
 # prepare
 packages_dir = os.path.join(
-    os.path.dirname(os.path.realpath(__file__)),
+    HERE,
     "packages")
 src_dir = os.path.join(
     packages_dir,
     "src")
+# prebuilt shared libraries, keyed by platform so a foreign binary is
+# never picked up
+bin_dir = os.path.join(
+    packages_dir,
+    "bin",
+    sysconfig.get_platform())
 print("packages_dir = {}\nsrc_dir = {}".format(
     packages_dir, src_dir))
 
@@ -34,23 +62,189 @@ sources = [
     ("sbc", "1.2.0"),
     ("dbus-python", "1.2.8")
 ]
-for lib in sources:
+
+@contextmanager
+def _install_lock():
+    """Serializes install-side steps. The file lock covers both the build
+    threads here and concurrent pip/setup.py invocations, all of which
+    write into shared library paths.
+    """
+    fd = os.open("/tmp/pytooth-install.lock", os.O_CREAT | os.O_RDWR, 0o666)
+    fcntl.flock(fd, fcntl.LOCK_EX)
+    try:
+        yield
+    finally:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+# the native libraries install into the virtualenv when one is active
+_prefix = os.environ.get("VIRTUAL_ENV", sys.prefix)
+
+# parallel make, unless the caller already set a job count via MAKEFLAGS
+if "-j" in os.environ.get("MAKEFLAGS", ""):
+    _make_cmd = ["make"]
+else:
+    _make_cmd = ["make", "-j{}".format(os.cpu_count() or 2)]
+
+# stamps recording what was last installed into the prefix, so no-op
+# reinstalls skip the whole configure/make/install cycle
+_stamp_dir = os.path.join(_prefix, ".pytooth_installed")
+
+def _fingerprint(lib):
+    """Returns a digest identifying one library's tarball contents and
+    the target prefix.
+    """
+    h = hashlib.sha256()
+    with open(os.path.join(
+        src_dir, "{}-{}.tar.gz".format(lib[0], lib[1])), "rb") as f:
+        h.update(f.read())
+    h.update(_prefix.encode())
+    return h.hexdigest()
+
+# route compiles through ccache when it is on PATH; rebuilding an
+# unchanged translation unit then costs a cache hit instead of a compile
+_build_env = None
+if shutil.which("ccache"):
+    _build_env = dict(
+        os.environ,
+        CC="ccache " + os.environ.get("CC", "gcc"),
+        CXX="ccache " + os.environ.get("CXX", "g++"))
+
+def _run(cmd, cwd):
+    """Runs one build step, aborting the install on a non-zero exit.
+    """
+    subprocess.run(
+        cmd, check=True, cwd=cwd, stdout=subprocess.DEVNULL,
+        env=_build_env)
+
+# lib directories that received a prebuilt; ldconfig runs over these
+# once after the build loop instead of once per library
+_prebuilt_lib_dirs = []
+
+def _try_prebuilt(lib):
+    """Installs a prebuilt shared library matching this platform, if one
+    is shipped. Returns False to fall back to a source build.
+    """
+    candidate = os.path.join(
+        bin_dir, "lib{}.so.{}".format(lib[0], lib[1]))
+    if not os.path.isfile(candidate):
+        return False
+
+    print("Installing prebuilt {}-{} library ...".format(
+        lib[0], lib[1]))
+    lib_dir = os.path.join(_prefix, "lib")
+    with _install_lock():
+        os.makedirs(lib_dir, exist_ok=True)
+        dst = os.path.join(
+            lib_dir, "lib{}.so.{}".format(lib[0], lib[1]))
+        shutil.copy2(candidate, dst)
+        # unversioned link for compile-time -l lookups; the soname link
+        # is left to the ldconfig pass after the loop
+        link = os.path.join(lib_dir, "lib{}.so".format(lib[0]))
+        try:
+            os.remove(link)
+        except FileNotFoundError:
+            pass
+        os.symlink(dst, link)
+    _prebuilt_lib_dirs.append(lib_dir)
+    return True
+
+def _build_lib(lib):
+    """Extracts, configures, builds and installs one source library.
+    Raises on the first failing step.
+    """
+    stamp = os.path.join(
+        _stamp_dir, "{}-{}.stamp".format(lib[0], lib[1]))
+    fingerprint = _fingerprint(lib)
+    try:
+        with open(stamp) as f:
+            if f.read() == fingerprint:
+                print("{}-{} is already installed - skipping.".format(
+                    lib[0], lib[1]))
+                return
+    except OSError:
+        pass
+
+    if _try_prebuilt(lib):
+        return
+
     print("Installing {}-{} library from source ...".format(
         lib[0], lib[1]))
-    os.system(
-        "cd '{srcdir}'; "
-        "tar xf {libname}-{libver}.tar.gz; "
-        "cd {libname}-{libver}; "
-        "./configure -prefix=$VIRTUAL_ENV -exec-prefix=$VIRTUAL_ENV >/dev/null; "
-        "make >/dev/null; "
-        "sudo make install >/dev/null; "
-        "if [ -f setup.py ]; then python setup.py install; fi; ".format(
-            srcdir=src_dir,
-            libname=lib[0],
-            libver=lib[1]))
+    build_dir = os.path.join(src_dir, "{}-{}".format(lib[0], lib[1]))
+    # in-process extraction: no tar fork, and the zlib work overlaps
+    # across libraries since the GIL is released during decompression
+    with tarfile.open(os.path.join(
+        src_dir, "{}-{}.tar.gz".format(lib[0], lib[1]))) as tf:
+        tf.extractall(src_dir)
+    _run(
+        ["./configure",
+            "-prefix=" + _prefix,
+            "-exec-prefix=" + _prefix],
+        cwd=build_dir)
+    _run(_make_cmd, cwd=build_dir)
+    with _install_lock():
+        _run(["sudo", "make", "install"], cwd=build_dir)
+        if os.path.isfile(os.path.join(build_dir, "setup.py")):
+            _run([sys.executable, "setup.py", "install"], cwd=build_dir)
+        os.makedirs(_stamp_dir, exist_ok=True)
+        with open(stamp, "w") as f:
+            f.write(fingerprint)
+
+def _build_native_libs():
+    """Builds and installs every bundled library, in parallel. The stamp
+    files make repeat invocations near-free.
+    """
+    # the libraries have no interdependencies, so their compile phases
+    # can use all cores; failures surface via the futures
+    with ThreadPoolExecutor(
+        max_workers=min(len(sources), os.cpu_count() or 1)) as executor:
+        futures = [executor.submit(_build_lib, lib) for lib in sources]
+        for future in as_completed(futures):
+            future.result()
+
+    # each ldconfig invocation rescans the directory, so one pass covers
+    # every prebuilt installed above
+    for lib_dir in sorted(set(_prebuilt_lib_dirs)):
+        subprocess.run(["ldconfig", "-n", lib_dir], check=False)
+
+class BuildNativeDeps(Command):
+    """Explicit entry point for the bundled library builds, e.g.
+    `python setup.py build_native`.
+    """
+
+    description = "build and install the bundled C libraries"
+    user_options = []
+
+    def initialize_options(self):
+        pass
+
+    def finalize_options(self):
+        pass
+
+    def run(self):
+        _build_native_libs()
+
+# metadata-only invocations (egg_info, --version, sdist, ...) must not
+# pay for - or require - a C toolchain, so the builds only run for
+# commands that produce an installable result
+_native_build_requested = any(cmd in sys.argv for cmd in (
+    "install", "develop", "bdist_wheel", "bdist_egg", "build_native"))
+if _native_build_requested and "build_native" not in sys.argv:
+    _build_native_libs()
+
+# optionally build the accelerated ring buffer; the pure-Python fallback
+# in pytooth.other.buffers is used when Cython is not installed
+ext_modules = []
+try:
+    from Cython.Build import cythonize
+    ext_modules = cythonize(["pytooth/other/_ring.pyx"])
+except ImportError:
+    print("Cython not installed - using pure-Python ring buffers.")
 
 # go-go
 setup(
+    cmdclass={"build_native": BuildNativeDeps},
+    ext_modules=ext_modules,
     name="pytooth",
     version="1.0.0",
     description="A Linux Bluez5-based implementation of A2DP and HFP.",
@@ -74,11 +268,22 @@ setup(
     zip_safe=False
 )
 
-# clean up working folders
-print("Cleaning up source folders ...")
-for lib in sources:
-    os.system(
-        "sudo rm -Rf '{srcdir}/{libname}-{libver}/'; ".format(
-            srcdir=src_dir,
-            libname=lib[0],
-            libver=lib[1]))
+def _remove_src_tree(lib):
+    """Removes one extracted source tree. Returns the path if anything
+    survived (root-owned files) for a batched privileged removal.
+    """
+    path = os.path.join(src_dir, "{}-{}".format(lib[0], lib[1]))
+    shutil.rmtree(path, ignore_errors=True)
+    return path if os.path.exists(path) else None
+
+# clean up working folders (only if a build could have created them)
+if _native_build_requested:
+    print("Cleaning up source folders ...")
+    with ThreadPoolExecutor(max_workers=len(sources)) as executor:
+        leftovers = [
+            path for path in executor.map(_remove_src_tree, sources)
+            if path]
+    # whatever rmtree could not delete was left root-owned by make
+    # install; one sudo covers the lot
+    if leftovers:
+        subprocess.run(["sudo", "rm", "-rf"] + leftovers, check=False)